@@ -1,7 +1,7 @@
 """Configuration management for VoltageGPU Twitter Bot."""
 
 import os
-import pytz
+from zoneinfo import ZoneInfo
 from typing import Tuple, Dict, Optional
 from datetime import time
 from dotenv import load_dotenv
@@ -29,7 +29,7 @@ class Config:
         
         # Bot configuration
         self.TIMEZONE = os.getenv("TIMEZONE", "Europe/Paris")
-        self.timezone = pytz.timezone(self.TIMEZONE)
+        self.timezone = ZoneInfo(self.TIMEZONE)
         self.DAILY_WRITES_TARGET_PER_ACCOUNT = int(os.getenv("DAILY_WRITES_TARGET_PER_ACCOUNT", "10"))
         self.daily_writes_target = self.DAILY_WRITES_TARGET_PER_ACCOUNT
         self.POST_WINDOW_LOCAL = os.getenv("POST_WINDOW_LOCAL", "09:00-23:30")
@@ -49,6 +49,7 @@ class Config:
         # Optional settings
         self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
         self.DATA_DIR = os.getenv("DATA_DIR", "./data")
+        self.STORE_READ_POOL_SIZE = int(os.getenv("STORE_READ_POOL_SIZE", "4"))  # Read-only DB connections for the tracker
         
         # Constants
         self.PROMO_CODE = "SHA-256-C7E8976BBAF2"
@@ -60,6 +61,7 @@ class Config:
         self.X_READS_MODE = os.getenv("X_READS_MODE", "conservative")  # conservative or normal
         self.MAX_READS_PER_DAY = int(os.getenv("MAX_READS_PER_DAY", "3"))  # Free tier: 100/month ≈ 3/day
         self.MAX_READS_PER_MONTH = int(os.getenv("MAX_READS_PER_MONTH", "100"))
+        self.TWITTER_SEARCH_PAGES = int(os.getenv("TWITTER_SEARCH_PAGES", "1"))  # Pages per trend search, each one read
         
         # Relevance filtering
         self.MIN_RELEVANCE_SCORE = float(os.getenv("MIN_RELEVANCE_SCORE", "0.55"))
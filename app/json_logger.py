@@ -0,0 +1,100 @@
+"""
+Structured JSON logger writing one entry per line to data/log.jsonl.
+Kept free of heavy imports so it can be used from the CLI entry point.
+"""
+
+import atexit
+import json
+import logging
+import queue
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(obj):
+    """Serialize datetimes as ISO 8601 (as orjson does natively) and anything else via str()."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps_json(payload) -> bytes:
+    """Serialize a payload to JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_json_default)
+    return json.dumps(payload, default=_json_default).encode('utf-8')
+
+
+def loads_json(data: bytes):
+    """Parse JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class JSONLogger:
+    """JSON logger for structured logging."""
+    
+    def __init__(self, log_file: str = 'data/log.jsonl'):
+        self.log_file = Path(log_file)
+        self.log_file.parent.mkdir(exist_ok=True)
+        
+        # Entries are queued and appended to the file by a listener thread,
+        # which keeps the file open instead of reopening it on every call.
+        self._queue = queue.Queue(-1)
+        self._logger = logging.getLogger(f"{__name__}.{self.log_file}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.DEBUG)
+        self._logger.addHandler(QueueHandler(self._queue))
+        self._listener = QueueListener(
+            self._queue,
+            logging.FileHandler(self.log_file, encoding='utf-8', delay=True)
+        )
+        self._listener.start()
+        atexit.register(self._listener.stop)
+        
+    def log(self, level: str, message: str, **kwargs):
+        """Log a message with additional data."""
+        entry = {
+            'timestamp': datetime.now().isoformat(),
+            'level': level,
+            'message': message,
+            **kwargs
+        }
+        
+        self.write(entry)
+    
+    def write(self, entry: dict):
+        """Append a raw entry as one JSON line through the shared file handle."""
+        try:
+            self._logger.info(dumps_json(entry).decode('utf-8'))
+        except Exception as e:
+            logger.error(f"Failed to write to JSON log: {e}")
+    
+    def info(self, message: str, **kwargs):
+        """Log info message."""
+        self.log('INFO', message, **kwargs)
+        
+    def error(self, message: str, **kwargs):
+        """Log error message."""
+        self.log('ERROR', message, **kwargs)
+        
+    def warning(self, message: str, **kwargs):
+        """Log warning message."""
+        self.log('WARNING', message, **kwargs)
+        
+    def debug(self, message: str, **kwargs):
+        """Log debug message."""
+        self.log('DEBUG', message, **kwargs)
+
+
+# Global JSON logger instance
+json_logger = JSONLogger()
@@ -4,20 +4,23 @@ Orchestrates all components and manages the bot lifecycle.
 """
 
 import asyncio
+import atexit
 import logging
+import queue
 import signal
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 import click
 
 from .config import Config
 from .store import Store
-from .twitter_client import TwitterClientManager
-from .trends import TrendsManager
-from .composer import TweetComposer
-from .scheduler import PostScheduler
-from .tracker import StatusTracker, json_logger
+from .json_logger import json_logger
+
+# Twitter, trends, composer, scheduler and tracker modules pull in tweepy,
+# APScheduler, FastAPI, etc. They are imported lazily in the initialize_*
+# methods so that `--help` and read-only commands start fast.
 
 # Import rate limit tracker and posting timer
 try:
@@ -27,23 +30,27 @@ except ImportError:
     rate_limit_tracker = None
     start_posting_timer = None
 
-# Configure logging with UTF-8 encoding for Windows
-import sys
-import io
-
-# Force UTF-8 for stdout on Windows
+# Force UTF-8 for stdout/stderr on Windows (in place, keeps existing buffering)
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+# Records are handed to a queue; console and file I/O happen on the
+# listener thread so logging never blocks the event loop.
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(
+    _log_queue,
+    logging.StreamHandler(),
+    logging.FileHandler('data/bot.log', encoding='utf-8')
+)
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('data/bot.log', encoding='utf-8')
-    ]
+    handlers=[QueueHandler(_log_queue)]
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +58,11 @@ logger = logging.getLogger(__name__)
 class VoltageGPUBot:
     """Main bot application class."""
     
+    __slots__ = (
+        'config', 'store', 'twitter_manager', 'trends_manager',
+        'composer', 'scheduler', 'tracker', 'running'
+    )
+    
     def __init__(self):
         self.config = None
         self.store = None
@@ -66,44 +78,9 @@ class VoltageGPUBot:
         try:
             logger.info("Initializing VoltageGPU Twitter Bot...")
             
-            # Initialize configuration
-            self.config = Config()
-            logger.info(f"Configuration loaded - Timezone: {self.config.timezone}")
-            
-            # Initialize database
-            self.store = Store(self.config)
-            await self.store.initialize()
-            logger.info("Database initialized")
-            
-            # Initialize Twitter clients
-            self.twitter_manager = TwitterClientManager(self.config)
-            await self.twitter_manager.initialize()
-            logger.info(f"Twitter clients initialized: {len(self.twitter_manager.clients)} accounts")
-            
-            # Initialize trends manager
-            self.trends_manager = TrendsManager(self.config, self.store)
-            search_client = self.twitter_manager.get_search_client()
-            if search_client:
-                self.trends_manager.set_twitter_client(search_client)
-            logger.info("Trends manager initialized")
-            
-            # Initialize composer
-            self.composer = TweetComposer(self.config, self.store, self.trends_manager)
-            logger.info("Tweet composer initialized")
-            
-            # Initialize scheduler
-            self.scheduler = PostScheduler(self.config, self.store)
-            self.scheduler.initialize(
-                self.twitter_manager.get_all_clients(),
-                self.composer,
-                self.trends_manager
-            )
-            logger.info("Scheduler initialized")
-            
-            # Initialize tracker
-            self.tracker = StatusTracker(self.config, self.store)
-            self.tracker.set_components(self.scheduler, self.trends_manager)
-            logger.info("Status tracker initialized")
+            await self.initialize_store()
+            await self.initialize_twitter()
+            await self.initialize_services()
             
             # Log successful initialization
             json_logger.info("Bot initialized successfully", 
@@ -116,6 +93,78 @@ class VoltageGPUBot:
             json_logger.error("Bot initialization failed", error=str(e))
             raise
     
+    async def initialize_store(self):
+        """Load configuration and open the database (no network access)."""
+        if self.store:
+            return
+        
+        # Initialize configuration
+        self.config = Config()
+        logger.info(f"Configuration loaded - Timezone: {self.config.timezone}")
+        
+        # Initialize database
+        self.store = Store(self.config)
+        await self.store.initialize()
+        logger.info("Database initialized")
+    
+    async def initialize_twitter(self):
+        """Initialize and verify the Twitter clients."""
+        if self.twitter_manager:
+            return
+        
+        from .twitter_client import TwitterClientManager
+        
+        self.twitter_manager = TwitterClientManager(self.config)
+        await self.twitter_manager.initialize()
+        logger.info(f"Twitter clients initialized: {len(self.twitter_manager.clients)} accounts")
+    
+    def initialize_trends(self):
+        """Initialize the trends manager, wiring the search client if available."""
+        if self.trends_manager:
+            return
+        
+        from .trends import TrendsManager
+        
+        self.trends_manager = TrendsManager(self.config, self.store)
+        if self.twitter_manager:
+            search_client = self.twitter_manager.get_search_client()
+            if search_client:
+                self.trends_manager.set_twitter_client(search_client)
+        logger.info("Trends manager initialized")
+    
+    def initialize_tracker(self):
+        """Initialize the status tracker with whatever components are available."""
+        if self.tracker:
+            return
+        
+        from .tracker import StatusTracker
+        
+        self.tracker = StatusTracker(self.config, self.store)
+        self.tracker.set_components(self.scheduler, self.trends_manager)
+        logger.info("Status tracker initialized")
+    
+    async def initialize_services(self):
+        """Initialize trends, composer, scheduler and tracker."""
+        from .composer import TweetComposer
+        from .scheduler import PostScheduler
+        
+        self.initialize_trends()
+        
+        # Initialize composer
+        self.composer = TweetComposer(self.config, self.store, self.trends_manager)
+        logger.info("Tweet composer initialized")
+        
+        # Initialize scheduler
+        self.scheduler = PostScheduler(self.config, self.store)
+        self.scheduler.initialize(
+            self.twitter_manager.get_all_clients(),
+            self.composer,
+            self.trends_manager
+        )
+        logger.info("Scheduler initialized")
+        
+        self.initialize_tracker()
+    
     async def start(self):
         """Start the bot and all services."""
         try:
@@ -181,27 +230,31 @@ class VoltageGPUBot:
             json_logger.error("Error during shutdown", error=str(e))
 
 
-# Global bot instance
-bot = VoltageGPUBot()
-
-
-def signal_handler(sig, frame):
-    """Handle shutdown signals."""
-    logger.info(f"Received signal {sig}, shutting down...")
-    asyncio.create_task(bot.stop())
-    sys.exit(0)
+def make_signal_handler(bot: VoltageGPUBot):
+    """Build a shutdown signal handler bound to the given bot."""
+    def signal_handler(sig, frame):
+        """Handle shutdown signals."""
+        logger.info(f"Received signal {sig}, shutting down...")
+        asyncio.create_task(bot.stop())
+        sys.exit(0)
+    
+    return signal_handler
 
 
 @click.group()
-def cli():
+@click.pass_context
+def cli(ctx):
     """VoltageGPU Twitter Bot CLI."""
-    pass
+    # Created only when a subcommand actually runs (not on import or --help)
+    ctx.obj = VoltageGPUBot()
 
 
 @cli.command()
-def run():
+@click.pass_obj
+def run(bot):
     """Run the bot."""
     # Setup signal handlers
+    signal_handler = make_signal_handler(bot)
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
@@ -213,6 +266,14 @@ def run():
         await bot.initialize()
         await bot.start()
     
+    # uvloop drives the scheduler and the embedded tracker server where available
+    if sys.platform != 'win32':
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -223,38 +284,46 @@ def run():
 
 
 @cli.command()
-def status():
+@click.pass_obj
+def status(bot):
     """Display current bot status."""
     async def get_status():
-        await bot.initialize()
+        # Read-only: only the store and tracker are needed
+        await bot.initialize_store()
+        bot.initialize_tracker()
         status = await bot.tracker._get_full_status()
         
-        print("\n=== VoltageGPU Twitter Bot Status ===\n")
-        print(f"Time: {status['now']}")
-        print(f"Timezone: {status['timezone']}")
-        print(f"Scheduler: {'Running' if status['scheduler_running'] else 'Stopped'}")
-        print(f"Posting Window: {status['posting_window']}")
-        print()
+        out = [
+            "",
+            "=== VoltageGPU Twitter Bot Status ===",
+            "",
+            f"Time: {status['now']}",
+            f"Timezone: {status['timezone']}",
+            f"Scheduler: {'Running' if status['scheduler_running'] else 'Stopped'}",
+            f"Posting Window: {status['posting_window']}",
+            "",
+        ]
         
-        print("Account A:")
-        print(f"  Next Run: {status['account_a']['next_run_local'] or 'Not scheduled'}")
-        print(f"  Posted Today: {status['account_a']['posted_today']}")
-        print(f"  Last Tweet: {status['account_a']['last_tweet_id'] or 'None'}")
-        print()
+        for account_id, key in (('A', 'account_a'), ('B', 'account_b')):
+            account = status[key]
+            out += [
+                f"Account {account_id}:",
+                f"  Next Run: {account['next_run_local'] or 'Not scheduled'}",
+                f"  Posted Today: {account['posted_today']}",
+                f"  Last Tweet: {account['last_tweet_id'] or 'None'}",
+                "",
+            ]
         
-        print("Account B:")
-        print(f"  Next Run: {status['account_b']['next_run_local'] or 'Not scheduled'}")
-        print(f"  Posted Today: {status['account_b']['posted_today']}")
-        print(f"  Last Tweet: {status['account_b']['last_tweet_id'] or 'None'}")
-        print()
-        
-        print(f"Daily Target: {status['writes_budget_today']['target']} posts per account")
-        print()
+        out += [
+            f"Daily Target: {status['writes_budget_today']['target']} posts per account",
+            "",
+        ]
         
         if status['trend_samples']:
-            print("Current Trends:")
-            for trend in status['trend_samples'][:5]:
-                print(f"  {trend}")
+            out.append("Current Trends:")
+            out += [f"  {trend}" for trend in status['trend_samples'][:5]]
+        
+        sys.stdout.write("\n".join(out) + "\n")
         
         await bot.store.close()
     
@@ -265,7 +334,8 @@ def status():
 @click.option('--account', '-a', type=click.Choice(['A', 'B']), required=True,
               help='Account to post from')
 @click.option('--dry-run', is_flag=True, help='Generate tweet without posting')
-def post(account, dry_run):
+@click.pass_obj
+def post(bot, account, dry_run):
     """Manually trigger a post."""
     async def manual_post():
         await bot.initialize()
@@ -303,24 +373,31 @@ def post(account, dry_run):
 
 
 @cli.command()
-def trends():
+@click.pass_obj
+def trends(bot):
     """Display current trending hashtags."""
     async def show_trends():
-        await bot.initialize()
+        await bot.initialize_store()
+        # Twitter search is skipped in conservative mode, so don't connect for nothing
+        if bot.config.X_READS_MODE != 'conservative':
+            await bot.initialize_twitter()
+        bot.initialize_trends()
         
         # Refresh trends
         print("Fetching latest trends...")
         trends = await bot.trends_manager.refresh_trends()
         
-        print("\n=== Current Trending Hashtags ===\n")
+        out = ["", "=== Current Trending Hashtags ===", ""]
         
         if trends:
             for i, trend in enumerate(trends[:20], 1):
                 sources = ', '.join(trend['sources'])
-                print(f"{i:2}. {trend['hashtag']:20} Score: {trend['score']:.2f} "
-                      f"Sources: [{sources}]")
+                out.append(f"{i:2}. {trend['hashtag']:20} Score: {trend['score']:.2f} "
+                           f"Sources: [{sources}]")
         else:
-            print("No trends available")
+            out.append("No trends available")
+        
+        sys.stdout.write("\n".join(out) + "\n")
         
         await bot.store.close()
     
@@ -329,12 +406,11 @@ def trends():
 
 @cli.command()
 @click.option('--days', '-d', default=7, help='Number of days to analyze')
-def metrics(days):
+@click.pass_obj
+def metrics(bot, days):
     """Display bot metrics."""
     async def show_metrics():
-        await bot.initialize()
-        
-        print(f"\n=== Bot Metrics (Last {days} Days) ===\n")
+        await bot.initialize_store()
         
         # Get metrics
         total_a = await bot.store.get_total_posts('A')
@@ -343,24 +419,28 @@ def metrics(days):
         today_b = await bot.store.get_posts_today('B')
         hashtags = await bot.store.get_unique_hashtags(days)
         
-        print(f"Total Posts:")
-        print(f"  Account A: {total_a}")
-        print(f"  Account B: {total_b}")
-        print(f"  Combined: {total_a + total_b}")
-        print()
-        
-        print(f"Posts Today:")
-        print(f"  Account A: {today_a}")
-        print(f"  Account B: {today_b}")
-        print(f"  Combined: {today_a + today_b}")
-        print()
-        
-        print(f"Unique Hashtags Used: {len(hashtags)}")
+        out = [
+            "",
+            f"=== Bot Metrics (Last {days} Days) ===",
+            "",
+            "Total Posts:",
+            f"  Account A: {total_a}",
+            f"  Account B: {total_b}",
+            f"  Combined: {total_a + total_b}",
+            "",
+            "Posts Today:",
+            f"  Account A: {today_a}",
+            f"  Account B: {today_b}",
+            f"  Combined: {today_a + today_b}",
+            "",
+            f"Unique Hashtags Used: {len(hashtags)}",
+        ]
         
         if hashtags:
-            print(f"\nTop 10 Hashtags:")
-            for tag in hashtags[:10]:
-                print(f"  {tag}")
+            out += ["", "Top 10 Hashtags:"]
+            out += [f"  {tag}" for tag in hashtags[:10]]
+        
+        sys.stdout.write("\n".join(out) + "\n")
         
         await bot.store.close()
     
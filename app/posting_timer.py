@@ -5,14 +5,20 @@ Posting timer - Shows countdown to next posts for each account
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from .rate_limit_tracker import write_console
 
 logger = logging.getLogger(__name__)
 
+ACCOUNTS = ('A', 'B')
+
 
 class PostingTimer:
     """Displays countdown timers for next posts"""
     
+    __slots__ = ('scheduler', 'rate_limit_tracker', 'running')
+    
     def __init__(self, scheduler, rate_limit_tracker=None):
         self.scheduler = scheduler
         self.rate_limit_tracker = rate_limit_tracker
@@ -22,83 +28,96 @@ class PostingTimer:
         """Start displaying timer every interval seconds"""
         self.running = True
         
+        loop = asyncio.get_running_loop()
+        
         while self.running:
-            self.display_timers()
+            # Build on the loop thread, write from a worker so slow consoles
+            # don't stall the scheduler
+            block = self.format_timers()
+            await loop.run_in_executor(None, write_console, block)
             await asyncio.sleep(interval)
     
     def display_timers(self):
         """Display current timers for both accounts"""
-        now = datetime.now(self.scheduler.config.timezone)
-        
-        print("\n" + "="*70)
-        print(f"⏰ POSTING SCHEDULE - {now.strftime('%H:%M:%S')}")
-        print("="*70)
-        
-        # Get next run times
-        next_runs = self.scheduler.get_next_run_times()
-        
-        # Display Account A
-        self._display_account_timer('A', next_runs.get('A'), now)
-        
-        print()  # Separator
-        
-        # Display Account B
-        self._display_account_timer('B', next_runs.get('B'), now)
-        
-        # Display rate limit info if available
+        write_console(self.format_timers())
+    
+    def format_timers(self) -> str:
+        """Build the timer display for both accounts"""
+        scheduler = self.scheduler
+        now = datetime.now(scheduler.config.timezone)
+        
+        lines = [
+            "",
+            "="*70,
+            f"⏰ POSTING SCHEDULE - {now.strftime('%H:%M:%S')}",
+            "="*70,
+        ]
+        
+        # Hoist the per-account lookups out of the loop
+        next_runs = scheduler.get_next_run_times()
+        daily_posts = scheduler.daily_posts
+        daily_target = scheduler.config.daily_writes_target
+        last_post_times = scheduler.last_post_times
+        
+        for i, account_id in enumerate(ACCOUNTS):
+            if i:
+                lines.append("")  # Separator
+            lines += self._format_account_timer(
+                account_id, next_runs.get(account_id), now,
+                daily_posts=daily_posts.get(account_id, 0),
+                daily_target=daily_target,
+                last_post=last_post_times.get(account_id)
+            )
+        
+        # Rate limit info if available
         if self.rate_limit_tracker:
-            self._display_rate_limit_info()
+            lines += self._format_rate_limit_info()
         
-        print("="*70 + "\n")
+        lines += ["="*70, "", ""]
+        return "\n".join(lines)
     
-    def _display_account_timer(self, account_id: str, next_run: Optional[datetime], now: datetime):
-        """Display timer for a specific account"""
+    def _format_account_timer(self, account_id: str, next_run: Optional[datetime], now: datetime,
+                              daily_posts: int, daily_target: int,
+                              last_post: Optional[datetime]) -> List[str]:
+        """Build the timer lines for a specific account"""
         
         # Check rate limit status first
         is_rate_limited = False
         rate_limit_reset = None
         
+        seconds_until_reset = 0
+        
         if self.rate_limit_tracker:
-            status = self.rate_limit_tracker.get_status()
-            account_status = status['accounts'][account_id]
+            account_status = self.rate_limit_tracker.get_raw_status(account_id)
             
             if account_status['status'] == 'rate_limited':
                 is_rate_limited = True
-                if 'rate_limit_reset' in account_status:
-                    rate_limit_reset = datetime.fromisoformat(account_status['rate_limit_reset'])
+                rate_limit_reset = account_status['rate_limit_reset']
+                seconds_until_reset = account_status['seconds_until_reset']
         
-        # Display account header
         emoji = "🚫" if is_rate_limited else "✅"
-        print(f"\n{emoji} ACCOUNT {account_id}:")
+        lines = [f"\n{emoji} ACCOUNT {account_id}:"]
         
-        # Display rate limit info if applicable
+        # Rate limit info if applicable
         if is_rate_limited and rate_limit_reset:
-            time_until_reset = rate_limit_reset - now
-            minutes_left = int(time_until_reset.total_seconds() / 60)
-            seconds_left = int(time_until_reset.total_seconds() % 60)
+            minutes_left, seconds_left = divmod(int(seconds_until_reset), 60)
             
-            print(f"   ⚠️ RATE LIMITED - Reset in: {minutes_left}m {seconds_left}s")
-            print(f"   📅 Reset time: {rate_limit_reset.strftime('%H:%M:%S')}")
+            lines.append(f"   ⚠️ RATE LIMITED - Reset in: {minutes_left}m {seconds_left}s")
+            lines.append(f"   📅 Reset time: {rate_limit_reset:%H:%M:%S}")
             
             # Check if there's a retry scheduled
-            jobs = self.scheduler.scheduler.get_jobs()
-            retry_job = None
-            for job in jobs:
-                if f'rate_limit_retry_{account_id}' in job.id:
-                    retry_job = job
-                    break
+            retry_job = self.scheduler.scheduler.get_job(f'rate_limit_retry_{account_id}')
             
             if retry_job and retry_job.next_run_time:
-                print(f"   🔄 Auto-retry scheduled at: {retry_job.next_run_time.strftime('%H:%M:%S')}")
+                lines.append(f"   🔄 Auto-retry scheduled at: {retry_job.next_run_time:%H:%M:%S}")
         
-        # Display next regular post time
+        # Next regular post time
         if next_run:
-            time_until_next = next_run - now
+            total = int((next_run - now).total_seconds())
             
-            if time_until_next.total_seconds() > 0:
-                hours = int(time_until_next.total_seconds() // 3600)
-                minutes = int((time_until_next.total_seconds() % 3600) // 60)
-                seconds = int(time_until_next.total_seconds() % 60)
+            if total > 0:
+                hours, rem = divmod(total, 3600)
+                minutes, seconds = divmod(rem, 60)
                 
                 # Format countdown
                 if hours > 0:
@@ -108,46 +127,44 @@ class PostingTimer:
                 else:
                     countdown = f"{seconds}s"
                 
-                print(f"   ⏱️ Next post in: {countdown}")
-                print(f"   📅 Scheduled for: {next_run.strftime('%H:%M:%S')}")
+                lines.append(f"   ⏱️ Next post in: {countdown}")
+                lines.append(f"   📅 Scheduled for: {next_run:%H:%M:%S}")
             else:
-                print(f"   ⏱️ Post imminent!")
+                lines.append("   ⏱️ Post imminent!")
         else:
-            print(f"   ❌ No posts scheduled")
+            lines.append("   ❌ No posts scheduled")
         
-        # Display daily stats
-        daily_posts = self.scheduler.daily_posts.get(account_id, 0)
-        daily_target = self.scheduler.config.daily_writes_target
+        # Daily stats
+        lines.append(f"   📊 Today's posts: {daily_posts}/{daily_target}")
         
-        print(f"   📊 Today's posts: {daily_posts}/{daily_target}")
-        
-        # Display last post time
-        last_post = self.scheduler.last_post_times.get(account_id)
+        # Last post time
         if last_post:
-            time_since = now - last_post
-            hours_ago = int(time_since.total_seconds() // 3600)
-            minutes_ago = int((time_since.total_seconds() % 3600) // 60)
+            hours_ago, rem = divmod(int((now - last_post).total_seconds()), 3600)
+            minutes_ago = rem // 60
             
             if hours_ago > 0:
                 ago_str = f"{hours_ago}h {minutes_ago}m ago"
             else:
                 ago_str = f"{minutes_ago}m ago"
             
-            print(f"   ✉️ Last post: {ago_str} ({last_post.strftime('%H:%M')})")
+            lines.append(f"   ✉️ Last post: {ago_str} ({last_post:%H:%M})")
+        
+        return lines
     
-    def _display_rate_limit_info(self):
-        """Display rate limit summary"""
+    def _format_rate_limit_info(self) -> List[str]:
+        """Build the rate limit summary lines"""
         status = self.rate_limit_tracker.get_status()
         
-        print("\n" + "-"*70)
-        print("📊 RATE LIMIT STATUS:")
+        lines = ["\n" + "-"*70, "📊 RATE LIMIT STATUS:"]
         
-        for account_id in ['A', 'B']:
+        for account_id in ACCOUNTS:
             account = status['accounts'][account_id]
             if account['status'] == 'rate_limited':
-                print(f"   Account {account_id}: ⚠️ RATE LIMITED (resets in {account.get('minutes_until_reset', '?')} min)")
+                lines.append(f"   Account {account_id}: ⚠️ RATE LIMITED (resets in {account.get('minutes_until_reset', '?')} min)")
             else:
-                print(f"   Account {account_id}: ✅ Ready ({account['posts_this_hour']}/50 this hour)")
+                lines.append(f"   Account {account_id}: ✅ Ready ({account['posts_this_hour']}/50 this hour)")
+        
+        return lines
     
     def stop(self):
         """Stop the timer display"""
@@ -3,7 +3,9 @@ Rate limit tracker for Twitter API
 Tracks rate limits per account and provides visibility
 """
 
+import asyncio
 import logging
+import sys
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 import json
@@ -14,6 +16,8 @@ logger = logging.getLogger(__name__)
 class RateLimitTracker:
     """Track and report rate limits for each Twitter account"""
     
+    __slots__ = ('limits', 'last_hour_reset')
+    
     def __init__(self):
         self.limits = {
             'A': {
@@ -87,6 +91,24 @@ class RateLimitTracker:
         
         return True, "Ready to post"
     
+    def get_raw_status(self, account_id: str) -> Dict:
+        """Get native (non-serialized) rate limit state for in-process consumers"""
+        now = datetime.now()
+        data = self.limits[account_id]
+        reset = data['rate_limit_reset']
+        
+        if reset and now < reset:
+            seconds_until_reset = (reset - now).total_seconds()
+        else:
+            reset = None
+            seconds_until_reset = 0.0
+        
+        return {
+            'status': data['status'],
+            'rate_limit_reset': reset,
+            'seconds_until_reset': seconds_until_reset
+        }
+    
     def get_status(self) -> Dict:
         """Get current status of all accounts"""
         now = datetime.now()
@@ -117,30 +139,51 @@ class RateLimitTracker:
         
         return status
     
-    def print_status(self):
-        """Print a formatted status report"""
+    def format_status(self) -> str:
+        """Build a formatted status report"""
         status = self.get_status()
         
-        print("\n" + "="*60)
-        print(f"📊 RATE LIMIT STATUS - {datetime.now().strftime('%H:%M:%S')}")
-        print("="*60)
+        out = [
+            "",
+            "="*60,
+            f"📊 RATE LIMIT STATUS - {datetime.now().strftime('%H:%M:%S')}",
+            "="*60,
+        ]
         
         for account_id, data in status['accounts'].items():
             emoji = "✅" if data['can_post'] else "🚫"
-            print(f"\n{emoji} Account {account_id}:")
-            print(f"   Status: {data['status']}")
-            print(f"   Can post: {data['reason']}")
-            print(f"   Posts (hour/day): {data['posts_this_hour']}/50, {data['posts_today']}/300")
+            out += [
+                f"\n{emoji} Account {account_id}:",
+                f"   Status: {data['status']}",
+                f"   Can post: {data['reason']}",
+                f"   Posts (hour/day): {data['posts_this_hour']}/50, {data['posts_today']}/300",
+            ]
             
             if 'minutes_until_reset' in data:
-                print(f"   ⏰ Rate limit resets in: {data['minutes_until_reset']} minutes")
+                out.append(f"   ⏰ Rate limit resets in: {data['minutes_until_reset']} minutes")
             
             if data['last_post']:
-                print(f"   Last successful post: {data['last_post']}")
+                out.append(f"   Last successful post: {data['last_post']}")
             if data['last_error']:
-                print(f"   Last error: {data['last_error']}")
+                out.append(f"   Last error: {data['last_error']}")
         
-        print("\n" + "="*60 + "\n")
+        out += ["\n" + "="*60, "", ""]
+        return "\n".join(out)
+    
+    def print_status(self):
+        """Print a formatted status report"""
+        write_console(self.format_status())
+    
+    async def print_status_async(self):
+        """Print the status report without blocking the event loop on console I/O"""
+        report = self.format_status()
+        await asyncio.get_running_loop().run_in_executor(None, write_console, report)
+
+
+def write_console(text: str):
+    """Write a pre-built block to stdout in one call"""
+    sys.stdout.write(text)
+    sys.stdout.flush()
 
 
 # Global instance
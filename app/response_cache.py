@@ -0,0 +1,101 @@
+"""
+TTL cache for serialized JSON API responses.
+Bursts of polling on /status and /metrics are served from memory.
+"""
+
+import time
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+
+from .json_logger import dumps_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Default response class for the tracker apps
+JSONResponseClass = ORJSONResponse if orjson is not None else JSONResponse
+
+# (epoch second, serialized /health body) shared by the tracker apps
+_health_cache = [0, b'']
+
+
+def health_response() -> Response:
+    """Build the /health response, re-serializing its body at most once per second."""
+    second = int(time.time())
+    if second != _health_cache[0]:
+        _health_cache[1] = dumps_json({"status": "healthy", "timestamp": datetime.now().isoformat()})
+        _health_cache[0] = second
+    return Response(content=_health_cache[1], media_type="application/json")
+
+
+class _CacheEntry:
+    """A serialized payload with its freshness deadlines."""
+
+    __slots__ = ('body', 'etag', 'expires_at', 'stale_until')
+
+    def __init__(self, body: bytes, etag: str, expires_at: float, stale_until: float):
+        self.body = body
+        self.etag = etag
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+
+class ResponseCache:
+    """Per-endpoint TTL cache with single-flight refresh and stale fallback."""
+
+    def __init__(self, stale_ttl: float = 300.0):
+        self.stale_ttl = stale_ttl
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def get(self, key: str, ttl: float, producer: Callable[[], Awaitable[Any]],
+                  if_none_match: Optional[str] = None) -> Response:
+        """Return the cached response for key, rebuilding it via producer when expired."""
+        entry = self._entries.get(key)
+        if entry and entry.expires_at > time.monotonic():
+            return self._response(entry, 'HIT', if_none_match)
+
+        # Only one coroutine rebuilds an expired entry; the rest wait and reuse it
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            if entry and entry.expires_at > now:
+                return self._response(entry, 'HIT', if_none_match)
+
+            try:
+                payload = await producer()
+            except Exception as e:
+                if entry and entry.stale_until > now:
+                    logger.warning(f"Serving stale {key} response: {e}")
+                    return self._response(entry, 'STALE', if_none_match)
+                raise
+
+            body = dumps_json(payload)
+            etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            entry = _CacheEntry(body, etag, now + ttl, now + ttl + self.stale_ttl)
+            self._entries[key] = entry
+            return self._response(entry, 'MISS', if_none_match)
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one cached entry, or all of them."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    @staticmethod
+    def _response(entry: _CacheEntry, cache_status: str, if_none_match: Optional[str]) -> Response:
+        """Build the HTTP response for an entry (304 if the client's copy is current)."""
+        headers = {'ETag': entry.etag, 'X-Cache': cache_status}
+        if if_none_match == entry.etag:
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -5,12 +5,13 @@ Ensures strict timing: A posts first, B follows 45 minutes later, both repeat ev
 
 import asyncio
 import logging
-from datetime import datetime, timedelta, time
-from typing import Dict, Optional, List, Callable
+import re
+from datetime import datetime, date, timedelta, time
+from typing import Dict, Optional, List, Callable, Set, Tuple
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.date import DateTrigger
-import pytz
+from apscheduler.triggers.cron import CronTrigger
 
 from .config import Config
 from .store import Store
@@ -27,6 +28,8 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+_HASHTAG_RE = re.compile(r'#\w+')
+
 
 class PostScheduler:
     """Manages posting schedule for dual Twitter accounts."""
@@ -35,14 +38,26 @@ class PostScheduler:
         self.config = config
         self.store = store
         self.scheduler = AsyncIOScheduler(timezone=config.timezone)
+        # Config is static once loaded; bind the hot values once
+        self._tz = config.timezone
+        self._daily_target = config.daily_writes_target
+        self._min_gap = config.min_gap_between_accounts
+        self._interval = config.post_interval_minutes
         self.twitter_clients = {}
         self.composer = None
         self.trends_manager = None
         self.gif_manager = TrendingGifManager()  # Initialize GIF manager
-        self.posting_lock = asyncio.Lock()
+        self.posting_locks = {'A': asyncio.Lock(), 'B': asyncio.Lock()}  # Per-account so A and B don't serialize
+        self._gap_lock = asyncio.Lock()  # Shared: the gap check and post reservation are atomic across accounts
         self.last_post_times = {'A': None, 'B': None}
+        # Post job ids per account, so next-run lookups don't scan every job
+        self._account_jobs: Dict[str, Set[str]] = {'A': set(), 'B': set()}
+        # add_job options (args, misfire_grace_time, ...) each job was last added with
+        self._job_options: Dict[str, Dict] = {}
         self.daily_posts = {'A': 0, 'B': 0}
         self.last_reset_date = None
+        # Localized posting-window bounds per day
+        self._window_cache: Dict[date, Tuple[datetime, datetime]] = {}
         
     def initialize(self, twitter_clients: Dict[str, TwitterClient], 
                   composer: TweetComposer, trends_manager: TrendsManager):
@@ -58,23 +73,27 @@ class PostScheduler:
             await self._reset_daily_counters()
             
             # Schedule trend refresh job (every 20 minutes)
-            self.scheduler.add_job(
+            self._ensure_job(
                 self.trends_manager.refresh_trends,
                 IntervalTrigger(minutes=20),
-                id='refresh_trends',
-                name='Refresh Trends',
-                replace_existing=True
+                'refresh_trends',
+                'Refresh Trends'
             )
             
             # Schedule daily counter reset at midnight
-            self.scheduler.add_job(
+            self._ensure_job(
                 self._reset_daily_counters,
-                'cron',
-                hour=0,
-                minute=0,
-                id='reset_daily',
-                name='Reset Daily Counters',
-                replace_existing=True
+                CronTrigger(hour=0, minute=0, timezone=self._tz),
+                'reset_daily',
+                'Reset Daily Counters'
+            )
+            
+            # Refresh SQLite planner statistics nightly, after the counter reset
+            self._ensure_job(
+                self.store.analyze,
+                CronTrigger(hour=0, minute=5, timezone=self._tz),
+                'analyze_db',
+                'Analyze Database'
             )
             
             # Start the scheduler
@@ -94,7 +113,7 @@ class PostScheduler:
     
     async def _schedule_initial_posts(self):
         """Schedule initial posts for both accounts."""
-        now = datetime.now(self.config.timezone)
+        now = datetime.now(self._tz)
         
         # Check if we're within posting window
         if not self._is_within_window(now):
@@ -103,24 +122,20 @@ class PostScheduler:
             logger.info(f"Outside posting window. Next window starts at {next_window}")
             
             # Schedule A for window start
-            self.scheduler.add_job(
-                self._post_for_account,
+            self._add_post_job(
+                'A',
                 DateTrigger(run_date=next_window),
-                args=['A'],
-                id='initial_post_A',
-                name='Initial Post A',
-                replace_existing=True
+                'initial_post_A',
+                'Initial Post A'
             )
             
             # Schedule B for 45 minutes after A
-            b_time = next_window + timedelta(minutes=self.config.min_gap_between_accounts)
-            self.scheduler.add_job(
-                self._post_for_account,
+            b_time = next_window + timedelta(minutes=self._min_gap)
+            self._add_post_job(
+                'B',
                 DateTrigger(run_date=b_time),
-                args=['B'],
-                id='initial_post_B',
-                name='Initial Post B',
-                replace_existing=True
+                'initial_post_B',
+                'Initial Post B'
             )
         else:
             # We're within window, post A immediately
@@ -130,26 +145,22 @@ class PostScheduler:
             asyncio.create_task(self._post_for_account('A'))
             
             # Schedule B for 45 minutes later
-            b_time = now + timedelta(minutes=self.config.min_gap_between_accounts)
+            b_time = now + timedelta(minutes=self._min_gap)
             if self._is_within_window(b_time):
-                self.scheduler.add_job(
-                    self._post_for_account,
+                self._add_post_job(
+                    'B',
                     DateTrigger(run_date=b_time),
-                    args=['B'],
-                    id='initial_post_B',
-                    name='Initial Post B',
-                    replace_existing=True
+                    'initial_post_B',
+                    'Initial Post B'
                 )
             else:
                 # B would be outside window, schedule for next window
                 next_window = self._get_next_window_start(b_time)
-                self.scheduler.add_job(
-                    self._post_for_account,
+                self._add_post_job(
+                    'B',
                     DateTrigger(run_date=next_window),
-                    args=['B'],
-                    id='initial_post_B',
-                    name='Initial Post B',
-                    replace_existing=True
+                    'initial_post_B',
+                    'Initial Post B'
                 )
         
         # Schedule recurring posts AFTER initial posts
@@ -158,20 +169,18 @@ class PostScheduler:
     
     def _schedule_recurring_posts(self, delay_for_b: bool = False):
         """Schedule recurring posts for both accounts."""
-        now = datetime.now(self.config.timezone)
+        now = datetime.now(self._tz)
         
         # Schedule A to post every 90 minutes (starting from next interval)
-        a_start = now + timedelta(minutes=self.config.post_interval_minutes)
-        self.scheduler.add_job(
-            self._post_for_account,
+        a_start = now + timedelta(minutes=self._interval)
+        self._add_post_job(
+            'A',
             IntervalTrigger(
-                minutes=self.config.post_interval_minutes,
+                minutes=self._interval,
                 start_date=a_start
             ),
-            args=['A'],
-            id='recurring_post_A',
-            name='Recurring Post A',
-            replace_existing=True,
+            'recurring_post_A',
+            'Recurring Post A',
             misfire_grace_time=60
         )
         
@@ -180,51 +189,66 @@ class PostScheduler:
         if delay_for_b:
             # Start B's recurring posts after the initial post + interval
             b_start = now + timedelta(
-                minutes=self.config.min_gap_between_accounts + self.config.post_interval_minutes
+                minutes=self._min_gap + self._interval
             )
         else:
             b_start = now + timedelta(
-                minutes=self.config.post_interval_minutes + self.config.min_gap_between_accounts
+                minutes=self._interval + self._min_gap
             )
             
-        self.scheduler.add_job(
-            self._post_for_account,
+        self._add_post_job(
+            'B',
             IntervalTrigger(
-                minutes=self.config.post_interval_minutes,
+                minutes=self._interval,
                 start_date=b_start
             ),
-            args=['B'],
-            id='recurring_post_B',
-            name='Recurring Post B',
-            replace_existing=True,
+            'recurring_post_B',
+            'Recurring Post B',
             misfire_grace_time=60
         )
     
     async def _post_for_account(self, account_id: str):
         """Execute a post for the specified account."""
-        async with self.posting_lock:
+        # Bind the timezone-aware clock and static limits once per post
+        now = datetime.now(self._tz)
+        daily_target = self._daily_target
+        min_gap = self._min_gap
+        
+        # Check minimum gap between accounts and reserve this post's slot under one
+        # shared lock, so A and B can't both pass the check while either is in flight;
+        # if it's too soon, reschedule instead of sleeping while holding a lock
+        other_account = 'B' if account_id == 'A' else 'A'
+        async with self._gap_lock:
+            other_last_post = self.last_post_times.get(other_account)
+            if other_last_post:
+                time_since_other = (now - other_last_post).total_seconds() / 60
+                if time_since_other < min_gap:
+                    wait_time = min_gap - time_since_other
+                    logger.info(f"Account {account_id}: Too soon after {other_account}, retrying in {wait_time:.1f} minutes")
+                    self._add_post_job(
+                        account_id,
+                        DateTrigger(run_date=now + timedelta(minutes=wait_time)),
+                        f'gap_retry_post_{account_id}',
+                        f'Gap Retry {account_id}'
+                    )
+                    return
+            previous_post_time = self.last_post_times.get(account_id)
+            self.last_post_times[account_id] = now
+        
+        posted = False
+        async with self.posting_locks[account_id]:
             try:
-                now = datetime.now(self.config.timezone)
-                
                 # Check if within posting window
                 if not self._is_within_window(now):
                     logger.info(f"Account {account_id}: Outside posting window, skipping")
                     return
                 
                 # Check daily limit
-                if self.daily_posts[account_id] >= self.config.daily_writes_target:
-                    logger.info(f"Account {account_id}: Daily limit reached ({self.daily_posts[account_id]})")
+                posted_today = self.daily_posts[account_id]
+                if posted_today >= daily_target:
+                    logger.info(f"Account {account_id}: Daily limit reached ({posted_today})")
                     return
                 
-                # Check minimum gap between accounts
-                other_account = 'B' if account_id == 'A' else 'A'
-                if self.last_post_times.get(other_account):
-                    time_since_other = (now - self.last_post_times[other_account]).total_seconds() / 60
-                    if time_since_other < self.config.min_gap_between_accounts:
-                        wait_time = self.config.min_gap_between_accounts - time_since_other
-                        logger.info(f"Account {account_id}: Too soon after {other_account}, waiting {wait_time:.1f} minutes")
-                        await asyncio.sleep(wait_time * 60)
-                
                 # Compose tweet
                 logger.info(f"Account {account_id}: Composing tweet")
                 tweet_content = await self.composer.compose_tweet(account_id)
@@ -254,8 +278,8 @@ class PostScheduler:
                 tweet_id = await client.post_tweet(tweet_content, media_url=gif_url)
                 
                 if tweet_id:
-                    # Update tracking
-                    self.last_post_times[account_id] = now
+                    # Update tracking (last_post_times was already reserved)
+                    posted = True
                     self.daily_posts[account_id] += 1
                     
                     # Store in database
@@ -263,11 +287,11 @@ class PostScheduler:
                         account_id=account_id,
                         tweet_id=tweet_id,
                         content=tweet_content,
-                        hashtags=self._extract_hashtags(tweet_content)
+                        hashtags=hashtags
                     )
                     
                     logger.info(f"Account {account_id}: Successfully posted tweet {tweet_id}")
-                    logger.info(f"Account {account_id}: Daily posts: {self.daily_posts[account_id]}/{self.config.daily_writes_target}")
+                    logger.info(f"Account {account_id}: Daily posts: {self.daily_posts[account_id]}/{daily_target}")
                     
                     # Track success in rate limiter
                     if rate_limit_tracker:
@@ -278,23 +302,20 @@ class PostScheduler:
                     # Track failure in rate limiter
                     if rate_limit_tracker:
                         # Check if it was a rate limit error (from twitter_client tracking)
-                        status = rate_limit_tracker.get_status()
-                        if status['accounts'][account_id]['status'] == 'rate_limited':
+                        account_status = rate_limit_tracker.get_raw_status(account_id)
+                        if account_status['status'] == 'rate_limited':
                             # Schedule retry after rate limit reset
-                            reset_time = status['accounts'][account_id].get('rate_limit_reset')
-                            if reset_time:
-                                from datetime import datetime
-                                reset_dt = datetime.fromisoformat(reset_time)
+                            reset_dt = account_status['rate_limit_reset']
+                            if reset_dt:
                                 logger.info(f"Account {account_id}: Scheduling retry after rate limit reset at {reset_dt.strftime('%H:%M:%S')}")
                                 
                                 # Schedule a one-time retry
-                                self.scheduler.add_job(
+                                self._ensure_job(
                                     self._post_for_account,
                                     DateTrigger(run_date=reset_dt),
-                                    args=[account_id],
-                                    id=f'rate_limit_retry_{account_id}',
-                                    name=f'Rate Limit Retry {account_id}',
-                                    replace_existing=True
+                                    f'rate_limit_retry_{account_id}',
+                                    f'Rate Limit Retry {account_id}',
+                                    args=[account_id]
                                 )
                     
             except Exception as e:
@@ -307,7 +328,11 @@ class PostScheduler:
                     
                     # Print status after error
                     if error_type == 'rate_limit':
-                        rate_limit_tracker.print_status()
+                        await rate_limit_tracker.print_status_async()
+            finally:
+                # Release the reservation unless a later attempt has replaced it
+                if not posted and self.last_post_times.get(account_id) == now:
+                    self.last_post_times[account_id] = previous_post_time
     
     def _is_within_window(self, dt: datetime) -> bool:
         """Check if datetime is within posting window."""
@@ -317,36 +342,71 @@ class PostScheduler:
     def _get_next_window_start(self, from_time: datetime) -> datetime:
         """Get the next window start time."""
         next_day = from_time.date() + timedelta(days=1)
-        return self.config.timezone.localize(
-            datetime.combine(next_day, self.config.post_window_start)
-        )
+        return self._window_bounds(next_day)[0]
+    
+    def _window_bounds(self, day: date) -> Tuple[datetime, datetime]:
+        """Get the localized posting window for a day (zoneinfo resolves DST on use)."""
+        bounds = self._window_cache.get(day)
+        if bounds is None:
+            tz = self._tz
+            bounds = (
+                datetime.combine(day, self.config.post_window_start, tzinfo=tz),
+                datetime.combine(day, self.config.post_window_end, tzinfo=tz)
+            )
+            # Only a few days are ever live; drop the old ones rather than grow
+            if len(self._window_cache) >= 8:
+                self._window_cache.clear()
+            self._window_cache[day] = bounds
+        return bounds
     
     def _extract_hashtags(self, content: str) -> List[str]:
         """Extract hashtags from tweet content."""
-        import re
-        return re.findall(r'#\w+', content)
+        return _HASHTAG_RE.findall(content)
     
     async def _reset_daily_counters(self):
         """Reset daily post counters."""
-        today = datetime.now(self.config.timezone).date()
+        today = datetime.now(self._tz).date()
         
         if self.last_reset_date != today:
             self.daily_posts = {'A': 0, 'B': 0}
             self.last_reset_date = today
             logger.info(f"Daily counters reset for {today}")
     
+    def _ensure_job(self, func: Callable, trigger, job_id: str, name: str, **kwargs):
+        """Add or replace a job, skipping the jobstore round-trip if it's unchanged."""
+        existing = self.scheduler.get_job(job_id)
+        # A trigger's pickled state holds every scheduling attribute (dates, interval
+        # or cron fields, timezone, jitter); job options are compared as passed
+        if (existing and existing.func == func and existing.name == name
+                and type(existing.trigger) is type(trigger)
+                and existing.trigger.__getstate__() == trigger.__getstate__()
+                and self._job_options.get(job_id) == kwargs):
+            return
+        self.scheduler.add_job(
+            func,
+            trigger,
+            id=job_id,
+            name=name,
+            replace_existing=True,
+            **kwargs
+        )
+        self._job_options[job_id] = kwargs
+    
+    def _add_post_job(self, account_id: str, trigger, job_id: str, name: str, **kwargs):
+        """Schedule a post job for an account and register its id."""
+        self._ensure_job(self._post_for_account, trigger, job_id, name, args=[account_id], **kwargs)
+        self._account_jobs[account_id].add(job_id)
+    
     def get_next_run_times(self) -> Dict[str, Optional[datetime]]:
         """Get next scheduled run times for each account."""
         next_runs = {'A': None, 'B': None}
         
-        jobs = self.scheduler.get_jobs()
-        for job in jobs:
-            if 'post_A' in job.id and job.next_run_time:
-                if not next_runs['A'] or job.next_run_time < next_runs['A']:
-                    next_runs['A'] = job.next_run_time
-            elif 'post_B' in job.id and job.next_run_time:
-                if not next_runs['B'] or job.next_run_time < next_runs['B']:
-                    next_runs['B'] = job.next_run_time
+        for account_id, job_ids in self._account_jobs.items():
+            for job_id in job_ids:
+                job = self.scheduler.get_job(job_id)
+                if job and job.next_run_time:
+                    if not next_runs[account_id] or job.next_run_time < next_runs[account_id]:
+                        next_runs[account_id] = job.next_run_time
         
         return next_runs
     
@@ -366,7 +426,7 @@ class PostScheduler:
                 'posted_today': self.daily_posts['B'],
                 'last_post_time': self.last_post_times['B'].isoformat() if self.last_post_times['B'] else None
             },
-            'daily_target': self.config.daily_writes_target,
+            'daily_target': self._daily_target,
             'posting_window': f"{self.config.post_window_start} - {self.config.post_window_end}"
         }
         
@@ -1,12 +1,13 @@
 """Database store for VoltageGPU Twitter Bot."""
 
 import aiosqlite
-import sqlite3
 import json
 import hashlib
+import functools
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Optional, Any
+from typing import AsyncIterator, List, Dict, Optional, Any
 from pathlib import Path
 import logging
 
@@ -14,6 +15,62 @@ from .config import Config
 
 logger = logging.getLogger(__name__)
 
+# Posts read per pooled-reader borrow when streaming recent posts
+STREAM_BATCH_SIZE = 25
+
+# Hot queries are kept as constant strings so the connection's statement
+# cache can reuse the prepared statements across calls.
+_SQL_CHECK_DUP = "SELECT COUNT(*) FROM posts WHERE content_hash = ? AND posted_at >= ?"
+_SQL_INSERT_POST = """
+    INSERT INTO posts (account, tweet_id, content, content_hash, hashtags,
+                       posted_at, posted_date, success, error_message)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_POSTS_TODAY = "SELECT COUNT(*) FROM posts WHERE account = ? AND posted_date = ? AND success = 1"
+_SQL_LAST_TWEET_ID = "SELECT tweet_id FROM posts WHERE account = ? AND success = 1 AND tweet_id IS NOT NULL ORDER BY posted_at DESC LIMIT 1"
+_SQL_ACCOUNT_STATS = """
+    SELECT
+        (SELECT COUNT(*) FROM posts WHERE account = ? AND posted_date = ? AND success = 1),
+        (SELECT tweet_id FROM posts WHERE account = ? AND success = 1 AND tweet_id IS NOT NULL
+         ORDER BY posted_at DESC LIMIT 1),
+        (SELECT value FROM bot_state WHERE key = ?)
+"""
+_SQL_INSERT_TREND = """
+    INSERT INTO trends (hashtag, source, score, region, extracted_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_LAST_POST = "SELECT content, posted_at FROM posts WHERE account = ? AND success = 1 ORDER BY posted_at DESC LIMIT 1"
+_SQL_RECENT_POSTS = "SELECT tweet_id, content, posted_at FROM posts WHERE account = ? AND success = 1 ORDER BY posted_at DESC LIMIT ?"
+# Keyset pages of recent posts for streaming; (posted_at, id) resumes after the last row sent
+_SQL_RECENT_POSTS_FIRST = """
+    SELECT tweet_id, content, posted_at, id FROM posts WHERE account = ? AND success = 1
+    ORDER BY posted_at DESC, id DESC LIMIT ?
+"""
+_SQL_RECENT_POSTS_AFTER = """
+    SELECT tweet_id, content, posted_at, id FROM posts WHERE account = ? AND success = 1
+    AND (posted_at, id) < (?, ?)
+    ORDER BY posted_at DESC, id DESC LIMIT ?
+"""
+_SQL_TOTAL_POSTS = "SELECT COUNT(*) FROM posts WHERE account = ? AND success = 1"
+_SQL_INSERT_POST_HASHTAG = "INSERT INTO post_hashtags (post_id, hashtag) VALUES (?, ?)"
+_SQL_RECENT_HASHTAGS = """
+    SELECT DISTINCT ph.hashtag FROM post_hashtags ph JOIN posts p ON p.id = ph.post_id
+    WHERE p.posted_at >= ? ORDER BY ph.hashtag
+"""
+_SQL_STATUS_BUNDLE = """
+    SELECT g.account, g.total, g.today, p.tweet_id, substr(p.content, 1, 100), p.posted_at
+    FROM (
+        SELECT account, COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE posted_date = ?) AS today,
+               MAX(posted_at) AS last_posted_at
+        FROM posts WHERE success = 1
+        GROUP BY account
+    ) g
+    JOIN posts p ON p.account = g.account AND p.success = 1 AND p.posted_at = g.last_posted_at
+"""
+_SQL_READS_TODAY = "SELECT COUNT(*) FROM api_reads WHERE created_at >= ? AND created_at < ? AND success = 1"
+_SQL_INSERT_API_READ = "INSERT INTO api_reads (endpoint, success) VALUES (?, ?)"
+
 class Store:
     """SQLite-based storage for bot state and history."""
     
@@ -22,14 +79,88 @@ class Store:
         self.config = config
         self.db_path = Path("data/bot.db")
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Single long-lived connection shared by all async methods
+        self._conn: Optional[aiosqlite.Connection] = None
+        # Serializes writes/transactions on the shared connection
+        self._lock = asyncio.Lock()
+        # Pool of query-only connections for the status tracker; under WAL their
+        # reads run in parallel and don't queue behind the scheduler's writes
+        self._read_pool_size = max(1, config.STORE_READ_POOL_SIZE)
+        self._read_pool: asyncio.Queue = asyncio.Queue()
+        self._read_conns: List[aiosqlite.Connection] = []
+        self._read_opening = 0
     
     async def initialize(self):
         """Initialize database tables."""
         await self._init_database()
     
+    async def _connection(self) -> aiosqlite.Connection:
+        """Return the shared connection, opening it on first use."""
+        if self._conn is None:
+            conn = aiosqlite.connect(self.db_path, isolation_level=None)
+            # Don't keep the process alive if close() is never reached
+            conn.daemon = True
+            self._conn = await conn
+            # auto_vacuum only takes effect on a new database (before any table exists)
+            await self._conn.executescript("""
+                PRAGMA auto_vacuum=INCREMENTAL;
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA cache_size=-20000;
+                PRAGMA mmap_size=268435456;
+            """)
+        return self._conn
+    
+    async def _open_reader(self) -> aiosqlite.Connection:
+        """Open a read-only connection for the pool."""
+        await self._connection()  # make sure the database is in WAL mode first
+        conn = aiosqlite.connect(self.db_path, isolation_level=None)
+        conn.daemon = True
+        conn = await conn
+        await conn.executescript("""
+            PRAGMA query_only=1;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-65536;
+            PRAGMA mmap_size=268435456;
+        """)
+        return conn
+    
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow a read-only connection, growing the pool lazily up to its size."""
+        if self._read_pool.empty() and len(self._read_conns) + self._read_opening < self._read_pool_size:
+            self._read_opening += 1
+            try:
+                conn = await self._open_reader()
+            finally:
+                self._read_opening -= 1
+            self._read_conns.append(conn)
+        else:
+            conn = await self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put_nowait(conn)
+    
+    @asynccontextmanager
+    async def _transaction(self):
+        """Run several statements atomically on the shared connection."""
+        conn = await self._connection()
+        async with self._lock:
+            await conn.execute("BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                await conn.rollback()
+                raise
+            else:
+                await conn.commit()
+    
     async def _init_database(self):
         """Initialize database tables."""
-        async with aiosqlite.connect(self.db_path) as conn:
+        conn = await self._connection()
+        async with self._lock:
             await conn.executescript("""
                 CREATE TABLE IF NOT EXISTS posts (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -39,6 +170,7 @@ class Store:
                     content_hash TEXT NOT NULL,
                     hashtags TEXT,
                     posted_at TIMESTAMP NOT NULL,
+                    posted_date TEXT,
                     success BOOLEAN NOT NULL DEFAULT 0,
                     error_message TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -69,28 +201,81 @@ class Store:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 );
                 
-                CREATE INDEX IF NOT EXISTS idx_posts_account_date ON posts(account, date(posted_at));
-                CREATE INDEX IF NOT EXISTS idx_posts_content_hash ON posts(content_hash);
+                CREATE TABLE IF NOT EXISTS post_hashtags (
+                    post_id INTEGER NOT NULL,
+                    hashtag TEXT NOT NULL
+                );
+                
+                CREATE TABLE IF NOT EXISTS api_reads (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    endpoint TEXT NOT NULL,
+                    success BOOLEAN DEFAULT 1,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                
+                DROP INDEX IF EXISTS idx_posts_account_date;
+                CREATE INDEX IF NOT EXISTS idx_posts_account_posted ON posts(account, success, posted_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_posts_posted_at ON posts(posted_at);
+                DROP INDEX IF EXISTS idx_posts_content_hash;
+                CREATE INDEX IF NOT EXISTS idx_posts_hash_posted ON posts(content_hash, posted_at);
                 CREATE INDEX IF NOT EXISTS idx_trends_hashtag ON trends(hashtag);
                 CREATE INDEX IF NOT EXISTS idx_trends_extracted_at ON trends(extracted_at);
+                CREATE INDEX IF NOT EXISTS idx_post_hashtags_tag ON post_hashtags(hashtag, post_id);
+                CREATE INDEX IF NOT EXISTS idx_api_reads_created ON api_reads(created_at);
+                
+                -- One-time backfill of post_hashtags from the space-separated column
+                WITH RECURSIVE split(post_id, tag, rest) AS (
+                    SELECT id, '', hashtags || ' ' FROM posts
+                    WHERE hashtags != '' AND NOT EXISTS (SELECT 1 FROM post_hashtags)
+                    UNION ALL
+                    SELECT post_id, substr(rest, 1, instr(rest, ' ') - 1), substr(rest, instr(rest, ' ') + 1)
+                    FROM split WHERE rest != ''
+                )
+                INSERT INTO post_hashtags (post_id, hashtag)
+                SELECT post_id, tag FROM split WHERE tag != '';
             """)
+            
+            # Databases created before posted_date existed get the column and a one-time backfill
+            cursor = await conn.execute("PRAGMA table_info(posts)")
+            if not any(row[1] == 'posted_date' for row in await cursor.fetchall()):
+                await conn.execute("ALTER TABLE posts ADD COLUMN posted_date TEXT")
+                await conn.execute("UPDATE posts SET posted_date = date(posted_at)")
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_posts_account_day ON posts(account, posted_date, success)"
+            )
+            # Index-only aggregation for get_status_bundle
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_posts_success_account "
+                "ON posts(account, posted_date, posted_at) WHERE success = 1"
+            )
+            
+            # Rehash stored posts once so dedup keeps matching after the switch to BLAKE2b
+            cursor = await conn.execute("SELECT value FROM bot_state WHERE key = 'content_hash_algo'")
+            if await cursor.fetchone() is None:
+                cursor = await conn.execute("SELECT id, content FROM posts")
+                rows = [(self.get_content_hash(content), post_id) for post_id, content in await cursor.fetchall()]
+                await conn.executemany("UPDATE posts SET content_hash = ? WHERE id = ?", rows)
+                await conn.execute(
+                    "INSERT INTO bot_state (key, value, updated_at) VALUES ('content_hash_algo', 'blake2b-8', ?)",
+                    (datetime.now(),)
+                )
     
-    def get_content_hash(self, content: str) -> str:
-        """Generate hash for content deduplication."""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def get_content_hash(content: str) -> str:
+        """Generate hash for content deduplication (memoized per draft)."""
+        # 64-bit BLAKE2b gives the same 16 hex chars as the old truncated SHA-256, cheaper
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
     
     async def is_duplicate_content(self, content: str, days: int = 30) -> bool:
         """Check if content is a duplicate within the specified days."""
         content_hash = self.get_content_hash(content)
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        async with aiosqlite.connect(self.db_path) as conn:
-            cursor = await conn.execute(
-                "SELECT COUNT(*) FROM posts WHERE content_hash = ? AND posted_at >= ?",
-                (content_hash, cutoff_date)
-            )
-            result = await cursor.fetchone()
-            return result[0] > 0 if result else False
+        conn = await self._connection()
+        cursor = await conn.execute(_SQL_CHECK_DUP, (content_hash, cutoff_date))
+        result = await cursor.fetchone()
+        return result[0] > 0 if result else False
     
     async def record_post(self, account_id: str, tweet_id: str, content: str, 
                          hashtags: List[str]) -> int:
@@ -98,235 +283,280 @@ class Store:
         content_hash = self.get_content_hash(content)
         hashtags_str = " ".join(hashtags) if hashtags else ""
         
-        async with aiosqlite.connect(self.db_path) as conn:
-            cursor = await conn.execute("""
-                INSERT INTO posts (account, tweet_id, content, content_hash, hashtags, 
-                                 posted_at, success, error_message)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (account_id, tweet_id, content, content_hash, hashtags_str, 
-                  datetime.now(), True, None))
-            await conn.commit()
-            return cursor.lastrowid
+        now = datetime.now()
+        
+        async with self._transaction() as conn:
+            cursor = await conn.execute(_SQL_INSERT_POST, (account_id, tweet_id, content, content_hash, hashtags_str, 
+                  now, now.date().isoformat(), True, None))
+            post_id = cursor.lastrowid
+            await self._insert_post_hashtags(conn, post_id, hashtags)
+        return post_id
+    
+    @staticmethod
+    async def _insert_post_hashtags(conn: aiosqlite.Connection, post_id: int, hashtags: List[str]):
+        """Store a post's hashtags one per row for set queries."""
+        if hashtags:
+            await conn.executemany(_SQL_INSERT_POST_HASHTAG, [(post_id, tag) for tag in hashtags])
     
     async def get_posts_today(self, account: str) -> int:
         """Get number of posts made today for an account."""
-        today = date.today()
-        async with aiosqlite.connect(self.db_path) as conn:
-            cursor = await conn.execute(
-                "SELECT COUNT(*) FROM posts WHERE account = ? AND date(posted_at) = ? AND success = 1",
-                (account, today)
-            )
-            result = await cursor.fetchone()
-            return result[0] if result else 0
+        today = date.today().isoformat()
+        conn = await self._connection()
+        cursor = await conn.execute(_SQL_POSTS_TODAY, (account, today))
+        result = await cursor.fetchone()
+        return result[0] if result else 0
     
-    def get_last_tweet_id(self, account: str) -> Optional[str]:
+    async def get_last_tweet_id(self, account: str) -> Optional[str]:
         """Get the last successful tweet ID for an account."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT tweet_id FROM posts WHERE account = ? AND success = 1 AND tweet_id IS NOT NULL ORDER BY posted_at DESC LIMIT 1",
-                (account,)
-            )
-            result = cursor.fetchone()
-            return result[0] if result else None
+        conn = await self._connection()
+        cursor = await conn.execute(_SQL_LAST_TWEET_ID, (account,))
+        result = await cursor.fetchone()
+        return result[0] if result else None
     
     async def update_trends(self, trends: List[Dict[str, Any]]):
         """Save trending hashtags."""
-        async with aiosqlite.connect(self.db_path) as conn:
-            for trend in trends:
-                await conn.execute("""
-                    INSERT INTO trends (hashtag, source, score, region, extracted_at)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
-                    trend['hashtag'],
-                    trend.get('source', 'unknown'),
-                    trend.get('score', 1.0),
-                    trend.get('region'),
-                    trend.get('timestamp', datetime.now())
-                ))
-            await conn.commit()
-    
-    def get_fresh_trends(self, limit: int = 20, max_age_minutes: int = 60) -> List[str]:
+        # One clock read for the whole batch; also covers trends with timestamp=None
+        now = datetime.now()
+        rows = [
+            (
+                trend['hashtag'],
+                trend.get('source', 'unknown'),
+                trend.get('score', 1.0),
+                trend.get('region'),
+                trend.get('timestamp') or now
+            )
+            for trend in trends
+        ]
+        
+        async with self._transaction() as conn:
+            await conn.executemany(_SQL_INSERT_TREND, rows)
+    
+    async def get_fresh_trends(self, limit: int = 20, max_age_minutes: int = 60) -> List[str]:
         """Get fresh trending hashtags."""
-        cutoff_time = datetime.now().replace(minute=datetime.now().minute - max_age_minutes)
+        cutoff_time = datetime.now() - timedelta(minutes=max_age_minutes)
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT hashtag, AVG(score) as avg_score
-                FROM trends 
-                WHERE extracted_at >= ?
-                GROUP BY hashtag
-                ORDER BY avg_score DESC, MAX(extracted_at) DESC
-                LIMIT ?
-            """, (cutoff_time, limit))
-            return [row[0] for row in cursor.fetchall()]
-    
-    def clean_old_trends(self, max_age_hours: int = 24):
+        conn = await self._connection()
+        cursor = await conn.execute("""
+            SELECT hashtag, AVG(score) as avg_score
+            FROM trends 
+            WHERE extracted_at >= ?
+            GROUP BY hashtag
+            ORDER BY avg_score DESC, MAX(extracted_at) DESC
+            LIMIT ?
+        """, (cutoff_time, limit))
+        return [row[0] for row in await cursor.fetchall()]
+    
+    async def clean_old_trends(self, max_age_hours: int = 24):
         """Clean old trend data."""
-        cutoff_time = datetime.now().replace(hour=datetime.now().hour - max_age_hours)
+        cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM trends WHERE extracted_at < ?", (cutoff_time,))
+        conn = await self._connection()
+        async with self._lock:
+            await conn.execute("DELETE FROM trends WHERE extracted_at < ?", (cutoff_time,))
     
-    def set_state(self, key: str, value: Any):
+    async def set_state(self, key: str, value: Any):
         """Set a state value."""
         value_str = json.dumps(value) if not isinstance(value, str) else value
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
+        conn = await self._connection()
+        async with self._lock:
+            await conn.execute("""
                 INSERT OR REPLACE INTO bot_state (key, value, updated_at)
                 VALUES (?, ?, ?)
             """, (key, value_str, datetime.now()))
     
-    def get_state(self, key: str, default: Any = None) -> Any:
+    async def get_state(self, key: str, default: Any = None) -> Any:
         """Get a state value."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT value FROM bot_state WHERE key = ?", (key,))
-            result = cursor.fetchone()
-            
-            if result is None:
-                return default
-            
-            try:
-                return json.loads(result[0])
-            except json.JSONDecodeError:
-                return result[0]
+        conn = await self._connection()
+        cursor = await conn.execute("SELECT value FROM bot_state WHERE key = ?", (key,))
+        result = await cursor.fetchone()
+        
+        if result is None:
+            return default
+        
+        return self._decode_state(result[0])
     
-    def log_schedule(self, account: str, scheduled_for: datetime, status: str = "pending"):
+    @staticmethod
+    def _decode_state(value: str) -> Any:
+        """Decode a stored state value (JSON, or the raw string)."""
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value
+    
+    async def log_schedule(self, account: str, scheduled_for: datetime, status: str = "pending"):
         """Log a scheduled post."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
+        conn = await self._connection()
+        async with self._lock:
+            await conn.execute("""
                 INSERT INTO schedule_log (account, scheduled_for, status)
                 VALUES (?, ?, ?)
             """, (account, scheduled_for, status))
     
-    def update_schedule_status(self, account: str, scheduled_for: datetime, 
-                             status: str, executed_at: Optional[datetime] = None):
+    async def update_schedule_status(self, account: str, scheduled_for: datetime, 
+                                     status: str, executed_at: Optional[datetime] = None):
         """Update schedule status."""
         if executed_at is None:
             executed_at = datetime.now()
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
+        conn = await self._connection()
+        async with self._lock:
+            await conn.execute("""
                 UPDATE schedule_log 
                 SET status = ?, executed_at = ?
                 WHERE account = ? AND scheduled_for = ?
             """, (status, executed_at, account, scheduled_for))
     
-    def get_account_stats(self, account: str) -> Dict[str, Any]:
+    async def get_account_stats(self, account: str) -> Dict[str, Any]:
         """Get comprehensive stats for an account."""
-        today = date.today()
+        today = date.today().isoformat()
         
-        with sqlite3.connect(self.db_path) as conn:
-            # Posts today
-            cursor = conn.execute(
-                "SELECT COUNT(*) FROM posts WHERE account = ? AND date(posted_at) = ? AND success = 1",
-                (account, today)
-            )
-            posts_today = cursor.fetchone()[0]
-            
-            # Last tweet ID
-            cursor = conn.execute(
-                "SELECT tweet_id FROM posts WHERE account = ? AND success = 1 AND tweet_id IS NOT NULL ORDER BY posted_at DESC LIMIT 1",
-                (account,)
-            )
-            result = cursor.fetchone()
-            last_tweet_id = result[0] if result else None
-            
-            # Next scheduled run
-            next_run = self.get_state(f"next_run_{account}")
-            
-            return {
-                "posts_today": posts_today,
-                "last_tweet_id": last_tweet_id,
-                "next_run": next_run
-            }
-
+        # Posts today, last tweet ID and next scheduled run in one row
+        conn = await self._connection()
+        cursor = await conn.execute(
+            _SQL_ACCOUNT_STATS, (account, today, account, f"next_run_{account}")
+        )
+        posts_today, last_tweet_id, next_run = await cursor.fetchone()
+        if next_run is not None:
+            next_run = self._decode_state(next_run)
+        
+        return {
+            "posts_today": posts_today,
+            "last_tweet_id": last_tweet_id,
+            "next_run": next_run
+        }
+    
     async def get_last_post(self, account_id: str) -> Optional[Dict[str, Any]]:
         """Get the last post for an account."""
-        async with aiosqlite.connect(self.db_path) as conn:
-            cursor = await conn.execute(
-                "SELECT content, posted_at FROM posts WHERE account = ? AND success = 1 ORDER BY posted_at DESC LIMIT 1",
-                (account_id,)
-            )
-            result = await cursor.fetchone()
-            if result:
-                return {
-                    'content': result[0],
-                    'timestamp': result[1]
-                }
-            return None
+        conn = await self._connection()
+        cursor = await conn.execute(_SQL_LAST_POST, (account_id,))
+        result = await cursor.fetchone()
+        if result:
+            return {
+                'content': result[0],
+                'timestamp': result[1]
+            }
+        return None
     
     async def get_recent_posts(self, account_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent posts for an account."""
-        async with aiosqlite.connect(self.db_path) as conn:
-            cursor = await conn.execute(
-                "SELECT tweet_id, content, posted_at FROM posts WHERE account = ? AND success = 1 ORDER BY posted_at DESC LIMIT ?",
-                (account_id, limit)
-            )
+        async with self.acquire() as conn:
+            cursor = await conn.execute(_SQL_RECENT_POSTS, (account_id, limit))
             results = await cursor.fetchall()
-            return [
-                {
+        return [
+            {
+                'tweet_id': row[0],
+                'content': row[1],
+                'timestamp': row[2]
+            }
+            for row in results
+        ]
+    
+    async def iter_recent_posts(self, account_id: str, limit: int = 10) -> AsyncIterator[Dict[str, Any]]:
+        """Yield recent posts for an account, reading them in bounded batches.
+        
+        A pooled reader is only borrowed while a batch is fetched, so a slow consumer
+        never holds one.
+        """
+        bound = None
+        remaining = limit
+        while remaining > 0:
+            size = min(remaining, STREAM_BATCH_SIZE)
+            async with self.acquire() as conn:
+                if bound is None:
+                    cursor = await conn.execute(_SQL_RECENT_POSTS_FIRST, (account_id, size))
+                else:
+                    cursor = await conn.execute(_SQL_RECENT_POSTS_AFTER, (account_id, *bound, size))
+                rows = await cursor.fetchall()
+            
+            for row in rows:
+                yield {
                     'tweet_id': row[0],
                     'content': row[1],
                     'timestamp': row[2]
                 }
-                for row in results
-            ]
+            if len(rows) < size:
+                return
+            remaining -= len(rows)
+            bound = (rows[-1][2], rows[-1][3])
     
     async def get_total_posts(self, account_id: str) -> int:
         """Get total number of posts for an account."""
-        async with aiosqlite.connect(self.db_path) as conn:
-            cursor = await conn.execute(
-                "SELECT COUNT(*) FROM posts WHERE account = ? AND success = 1",
-                (account_id,)
-            )
+        async with self.acquire() as conn:
+            cursor = await conn.execute(_SQL_TOTAL_POSTS, (account_id,))
             result = await cursor.fetchone()
-            return result[0] if result else 0
+        return result[0] if result else 0
+    
+    async def get_status_bundle(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-account post totals, today's count and the last post (preview only) in one query."""
+        bundle = {
+            account: {
+                'total_posts': 0,
+                'posts_today': 0,
+                'last_tweet_id': None,
+                'content_preview': None,
+                'last_post_time': None
+            }
+            for account in ('A', 'B')
+        }
+        
+        async with self.acquire() as conn:
+            cursor = await conn.execute(_SQL_STATUS_BUNDLE, (date.today().isoformat(),))
+            rows = await cursor.fetchall()
+        for account, total, today, tweet_id, preview, posted_at in rows:
+            bundle[account] = {
+                'total_posts': total,
+                'posts_today': today,
+                'last_tweet_id': tweet_id,
+                'content_preview': preview,
+                'last_post_time': posted_at
+            }
+        return bundle
     
     async def get_unique_hashtags(self, days: int = 7) -> List[str]:
         """Get unique hashtags used in the last N days."""
         cutoff_date = datetime.now() - timedelta(days=days)
-        async with aiosqlite.connect(self.db_path) as conn:
-            cursor = await conn.execute(
-                "SELECT DISTINCT hashtags FROM posts WHERE posted_at >= ? AND hashtags != ''",
-                (cutoff_date,)
-            )
-            results = await cursor.fetchall()
-            hashtags = set()
-            for row in results:
-                if row[0]:
-                    hashtags.update(row[0].split())
-            return sorted(list(hashtags))
+        async with self.acquire() as conn:
+            cursor = await conn.execute(_SQL_RECENT_HASHTAGS, (cutoff_date,))
+            rows = await cursor.fetchall()
+        return [row[0] for row in rows]
+    
+    async def analyze(self):
+        """Refresh planner statistics and return free pages to the OS."""
+        conn = await self._connection()
+        async with self._lock:
+            await conn.execute("ANALYZE")
+            await conn.execute("PRAGMA incremental_vacuum")
     
     async def close(self):
         """Close database connections."""
-        # Nothing to close for now as we use context managers
-        pass
+        for conn in self._read_conns:
+            await conn.close()
+        self._read_conns.clear()
+        self._read_pool = asyncio.Queue()
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
     
     async def get_reads_today(self) -> int:
         """Get number of API reads made today."""
         today = date.today()
-        async with aiosqlite.connect(self.db_path) as conn:
-            cursor = await conn.execute(
-                "SELECT COUNT(*) FROM api_reads WHERE date(created_at) = ? AND success = 1",
-                (today,)
-            )
-            result = await cursor.fetchone()
-            return result[0] if result else 0
+        # Half-open range on the text timestamp so idx_api_reads_created is used
+        conn = await self._connection()
+        cursor = await conn.execute(_SQL_READS_TODAY, (today.isoformat(), (today + timedelta(days=1)).isoformat()))
+        result = await cursor.fetchone()
+        return result[0] if result else 0
     
     async def record_api_read(self, endpoint: str):
         """Record an API read operation."""
-        async with aiosqlite.connect(self.db_path) as conn:
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS api_reads (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    endpoint TEXT NOT NULL,
-                    success BOOLEAN DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            await conn.execute(
-                "INSERT INTO api_reads (endpoint, success) VALUES (?, ?)",
-                (endpoint, True)
-            )
-            await conn.commit()
+        conn = await self._connection()
+        async with self._lock:
+            await conn.execute(_SQL_INSERT_API_READ, (endpoint, True))
+    
+    async def record_api_reads_bulk(self, counts: Dict[str, int]):
+        """Record buffered API read counts per endpoint in one transaction."""
+        rows = [(endpoint, True) for endpoint, n in counts.items() for _ in range(n)]
+        if not rows:
+            return
+        async with self._transaction() as conn:
+            await conn.executemany(_SQL_INSERT_API_READ, rows)
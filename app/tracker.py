@@ -3,24 +3,46 @@ Status tracker and HTTP API for monitoring bot operations.
 Provides real-time status information and metrics.
 """
 
-import json
+import time
 import logging
 import asyncio
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Literal, Optional
 from pathlib import Path
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import uvicorn
 
 from .config import Config
 from .store import Store
 from .scheduler import PostScheduler
 from .trends import TrendsManager
+from .json_logger import JSONLogger, json_logger, dumps_json  # noqa: F401 (re-exported)
+from .response_cache import JSONResponseClass, ResponseCache, health_response
 
 logger = logging.getLogger(__name__)
 
+# Seconds a serialized /status or /metrics body is reused across requests
+STATUS_CACHE_TTL = 5
+METRICS_CACHE_TTL = 30
+# Seconds the database file size is reused before stat()ing it again
+DB_SIZE_TTL = 60
+
+# The root payload never changes, so it is serialized once
+ROOT_BODY = dumps_json({
+    "service": "VoltageGPU Twitter Bot",
+    "status": "running",
+    "endpoints": [
+        "/status",
+        "/metrics",
+        "/posts/{account_id}",
+        "/trends",
+        "/health"
+    ]
+})
+
 
 class StatusTracker:
     """Tracks and reports bot status and metrics."""
@@ -28,9 +50,18 @@ class StatusTracker:
     def __init__(self, config: Config, store: Store):
         self.config = config
         self.store = store
+        # Static config values used on every status build
+        self._tz = config.timezone
+        self._tz_str = str(config.timezone)
+        self._dw_target = config.daily_writes_target
         self.scheduler = None
         self.trends_manager = None
-        self.app = FastAPI(title="VoltageGPU Twitter Bot", version="1.0.0")
+        self._cache = ResponseCache()
+        self._db_size_cache = (0.0, 0.0)  # (size_mb, expires_at)
+        self.app = FastAPI(
+            title="VoltageGPU Twitter Bot", version="1.0.0",
+            default_response_class=JSONResponseClass
+        )
         self._setup_routes()
         self._setup_middleware()
         
@@ -48,6 +79,8 @@ class StatusTracker:
             allow_methods=["*"],
             allow_headers=["*"],
         )
+        # Added last so it wraps CORS; JSON bodies compress well
+        self.app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
         
     def _setup_routes(self):
         """Setup API routes."""
@@ -55,47 +88,54 @@ class StatusTracker:
         @self.app.get("/")
         async def root():
             """Root endpoint."""
-            return {
-                "service": "VoltageGPU Twitter Bot",
-                "status": "running",
-                "endpoints": [
-                    "/status",
-                    "/metrics",
-                    "/posts/{account_id}",
-                    "/trends",
-                    "/health"
-                ]
-            }
+            return Response(content=ROOT_BODY, media_type="application/json")
         
         @self.app.get("/status")
-        async def get_status():
+        async def get_status(request: Request):
             """Get comprehensive bot status."""
             try:
-                status = await self._get_full_status()
-                return JSONResponse(content=status)
+                return await self._cache.get(
+                    'status', STATUS_CACHE_TTL, self._get_full_status,
+                    request.headers.get('if-none-match')
+                )
             except Exception as e:
                 logger.error(f"Error getting status: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
         
         @self.app.get("/metrics")
-        async def get_metrics():
+        async def get_metrics(request: Request):
             """Get detailed metrics."""
             try:
-                metrics = await self._get_metrics()
-                return JSONResponse(content=metrics)
+                return await self._cache.get(
+                    'metrics', METRICS_CACHE_TTL, self._get_metrics,
+                    request.headers.get('if-none-match')
+                )
             except Exception as e:
                 logger.error(f"Error getting metrics: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
         
         @self.app.get("/posts/{account_id}")
-        async def get_account_posts(account_id: str):
-            """Get recent posts for specific account."""
-            if account_id not in ['A', 'B']:
-                raise HTTPException(status_code=400, detail="Invalid account ID")
+        async def get_account_posts(account_id: Literal['A', 'B'], request: Request,
+                                    limit: int = Query(10, ge=1, le=100)):
+            """Get recent posts for specific account (other IDs are rejected with 422)."""
+            # Clients that accept NDJSON get one post per line, streamed in store batches
+            if 'application/x-ndjson' in request.headers.get('accept', ''):
+                async def stream_posts():
+                    posts = self.store.iter_recent_posts(account_id, limit=limit)
+                    try:
+                        async for post in posts:
+                            yield dumps_json(post) + b'\n'
+                    except Exception as e:
+                        # Headers are already sent, so the stream just ends early
+                        logger.error(f"Error streaming posts for account {account_id}: {e}")
+                    finally:
+                        # Runs on client disconnect too, releasing the batch reader if one is held
+                        await posts.aclose()
+                return StreamingResponse(stream_posts(), media_type="application/x-ndjson")
             
             try:
-                posts = await self.store.get_recent_posts(account_id, limit=10)
-                return JSONResponse(content={"account": account_id, "posts": posts})
+                posts = await self.store.get_recent_posts(account_id, limit=limit)
+                return {"account": account_id, "posts": posts}
             except Exception as e:
                 logger.error(f"Error getting posts for account {account_id}: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
@@ -106,8 +146,8 @@ class StatusTracker:
             try:
                 if self.trends_manager:
                     samples = self.trends_manager.get_trend_samples()
-                    return JSONResponse(content={"trends": samples})
-                return JSONResponse(content={"trends": []})
+                    return {"trends": samples}
+                return {"trends": []}
             except Exception as e:
                 logger.error(f"Error getting trends: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
@@ -115,11 +155,11 @@ class StatusTracker:
         @self.app.get("/health")
         async def health_check():
             """Health check endpoint."""
-            return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+            return health_response()
     
     async def _get_full_status(self) -> Dict[str, Any]:
         """Get comprehensive status information."""
-        now = datetime.now(self.config.timezone)
+        now = datetime.now(self._tz)
         
         # Get scheduler status
         scheduler_status = self.scheduler.get_status() if self.scheduler else {}
@@ -127,27 +167,13 @@ class StatusTracker:
         # Get trend samples
         trend_samples = self.trends_manager.get_trend_samples() if self.trends_manager else []
         
-        # Get recent posts for each account
-        recent_posts = {}
-        for account_id in ['A', 'B']:
-            posts = await self.store.get_recent_posts(account_id, limit=1)
-            if posts:
-                recent_posts[account_id] = {
-                    'last_tweet_id': posts[0].get('tweet_id'),
-                    'last_post_time': posts[0].get('timestamp'),
-                    'content_preview': posts[0].get('content', '')[:100] + '...'
-                }
-            else:
-                recent_posts[account_id] = {
-                    'last_tweet_id': None,
-                    'last_post_time': None,
-                    'content_preview': None
-                }
+        # Last post for each account, from a single store query
+        recent_posts = await self.store.get_status_bundle()
         
         # Build status response
         status = {
             'now': now.isoformat(),
-            'timezone': str(self.config.timezone),
+            'timezone': self._tz_str,
             'account_a': {
                 'next_run_local': scheduler_status.get('account_a', {}).get('next_run'),
                 'posted_today': scheduler_status.get('account_a', {}).get('posted_today', 0),
@@ -164,7 +190,7 @@ class StatusTracker:
             'writes_budget_today': {
                 'A': scheduler_status.get('account_a', {}).get('posted_today', 0),
                 'B': scheduler_status.get('account_b', {}).get('posted_today', 0),
-                'target': self.config.daily_writes_target
+                'target': self._dw_target
             },
             'posting_window': scheduler_status.get('posting_window', 'Not configured'),
             'scheduler_running': scheduler_status.get('scheduler_running', False)
@@ -174,16 +200,15 @@ class StatusTracker:
     
     async def _get_metrics(self) -> Dict[str, Any]:
         """Get detailed metrics."""
-        # Get post counts
-        total_posts_a = await self.store.get_total_posts('A')
-        total_posts_b = await self.store.get_total_posts('B')
-        
-        # Get today's posts
-        today_posts_a = await self.store.get_posts_today('A')
-        today_posts_b = await self.store.get_posts_today('B')
-        
-        # Get unique hashtags used
-        unique_hashtags = await self.store.get_unique_hashtags(days=7)
+        # Get post counts and unique hashtags used, concurrently
+        bundle, unique_hashtags = await asyncio.gather(
+            self.store.get_status_bundle(),
+            self.store.get_unique_hashtags(days=7)
+        )
+        total_posts_a = bundle['A']['total_posts']
+        total_posts_b = bundle['B']['total_posts']
+        today_posts_a = bundle['A']['posts_today']
+        today_posts_b = bundle['B']['posts_today']
         
         metrics = {
             'total_posts': {
@@ -211,18 +236,24 @@ class StatusTracker:
         return 0.0
     
     def _get_database_size(self) -> float:
-        """Get database file size in MB."""
+        """Get database file size in MB (re-read at most once per DB_SIZE_TTL)."""
+        size_mb, expires_at = self._db_size_cache
+        now = time.monotonic()
+        if now < expires_at:
+            return size_mb
+        
+        size_mb = 0.0
         try:
-            db_path = Path(self.store.db_path)
-            if db_path.exists():
-                size_bytes = db_path.stat().st_size
-                return round(size_bytes / (1024 * 1024), 2)
+            size_mb = round(Path(self.store.db_path).stat().st_size / (1024 * 1024), 2)
         except Exception:
             pass
-        return 0.0
+        self._db_size_cache = (size_mb, now + DB_SIZE_TTL)
+        return size_mb
     
     async def start_server(self, host: str = "0.0.0.0", port: int = 8000):
         """Start the FastAPI server."""
+        # Runs on the bot's own loop (uvloop when installed); http="auto" picks
+        # httptools when available. One process: routes read in-memory state.
         config = uvicorn.Config(
             app=self.app,
             host=host,
@@ -247,61 +278,12 @@ class StatusTracker:
                        f"Posted: {status['account_b']['posted_today']}")
             logger.info(f"Trends: {', '.join(status['trend_samples'][:3])}")
             
-            # Log to JSON file
-            log_path = Path('data/log.jsonl')
-            log_path.parent.mkdir(exist_ok=True)
-            
-            with open(log_path, 'a') as f:
-                json.dump({
-                    'timestamp': status['now'],
-                    'type': 'status',
-                    'data': status
-                }, f)
-                f.write('\n')
+            # Log to JSON file (the JSON logger keeps data/log.jsonl open)
+            json_logger.write({
+                'timestamp': status['now'],
+                'type': 'status',
+                'data': status
+            })
                 
         except Exception as e:
             logger.error(f"Error logging status: {e}")
-
-
-class JSONLogger:
-    """JSON logger for structured logging."""
-    
-    def __init__(self, log_file: str = 'data/log.jsonl'):
-        self.log_file = Path(log_file)
-        self.log_file.parent.mkdir(exist_ok=True)
-        
-    def log(self, level: str, message: str, **kwargs):
-        """Log a message with additional data."""
-        entry = {
-            'timestamp': datetime.now().isoformat(),
-            'level': level,
-            'message': message,
-            **kwargs
-        }
-        
-        try:
-            with open(self.log_file, 'a') as f:
-                json.dump(entry, f)
-                f.write('\n')
-        except Exception as e:
-            logger.error(f"Failed to write to JSON log: {e}")
-    
-    def info(self, message: str, **kwargs):
-        """Log info message."""
-        self.log('INFO', message, **kwargs)
-        
-    def error(self, message: str, **kwargs):
-        """Log error message."""
-        self.log('ERROR', message, **kwargs)
-        
-    def warning(self, message: str, **kwargs):
-        """Log warning message."""
-        self.log('WARNING', message, **kwargs)
-        
-    def debug(self, message: str, **kwargs):
-        """Log debug message."""
-        self.log('DEBUG', message, **kwargs)
-
-
-# Global JSON logger instance
-json_logger = JSONLogger()
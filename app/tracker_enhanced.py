@@ -2,40 +2,99 @@
 Enhanced Tracker with Advanced Metrics and Controls
 """
 
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-import json
+from typing import Dict, List, Literal, Optional
+import os
 import asyncio
 from pathlib import Path
 import sqlite3
-import random
 import uuid
+import psutil
+from types import SimpleNamespace
+
+from .json_logger import loads_json
+from .composer_optimized import OptimizedComposer
+from .trends_filter import TrendFilter
+from .response_cache import JSONResponseClass, ResponseCache, health_response
+
+# Seconds a serialized /status or /metrics body is reused across requests
+STATUS_CACHE_TTL = 5
+METRICS_CACHE_TTL = 30
+
+# Trend cache files, most authoritative first
+TREND_FILES = [
+    ("data/pulsed_trends.json", "X_SEARCH"),
+    ("data/realtime_trends.json", "PYTRENDS"),
+    ("data/trends_cache.json", "SEMANTIC")
+]
+
+# Angle rotation order and the distribution used before any stats exist
+ANGLES = ("cost", "latency", "autoscale", "regions", "uptime", "support")
+DEFAULT_ANGLE_DISTRIBUTION = {angle: 0 for angle in ANGLES}
+
+# Pause bitmask: one bit per account, accepting both ID spellings
+ACCOUNT_BITS = {"A": 1, "B": 2, "account_a": 1, "account_b": 2, "all": 3}
+PAUSED_LISTS = {0: [], 1: ["A"], 2: ["B"], 3: ["A", "B"]}
+
+# Seconds between reloads of the data/*.json snapshot
+SNAPSHOT_REFRESH_SECONDS = 20
+
+# Store account keys for the tracker's account names
+STORE_ACCOUNTS = {"account_a": "A", "account_b": "B"}
 
 class EnhancedTracker:
     """Advanced tracking and monitoring system"""
     
     def __init__(self, store, scheduler):
-        self.app = FastAPI(title="VoltageGPU Bot Tracker")
+        self.app = FastAPI(title="VoltageGPU Bot Tracker", default_response_class=JSONResponseClass)
         self.store = store
         self.scheduler = scheduler
-        self.paused_accounts = set()
+        self._paused_mask = 0
         self.cooldown_until = None
+        self._cache = ResponseCache()
+        # Parsed data/*.json files keyed by path, with the mtime they were read at
+        self._json_cache: Dict[str, tuple] = {}
+        # In-memory view of the data/*.json files, reloaded in the background
+        self._snap = self._load_all()
+        self._snapshot_task: Optional[asyncio.Task] = None
+        # Reused process handle; priming cpu_percent lets later calls return without blocking
+        self._proc = psutil.Process()
+        psutil.cpu_percent(interval=None)
+        # Built once and shared (it holds no per-request state); the TF-IDF domain
+        # vector is the expensive part of TrendFilter
+        self._filter = TrendFilter()
+        self.app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
         self.setup_routes()
         
     def setup_routes(self):
         """Setup all API routes"""
         
+        @self.app.on_event("startup")
+        async def start_snapshot_refresh():
+            self._snapshot_task = asyncio.create_task(self._refresh_snapshots())
+        
+        @self.app.on_event("shutdown")
+        async def stop_snapshot_refresh():
+            if self._snapshot_task:
+                self._snapshot_task.cancel()
+        
         @self.app.get("/status")
-        async def get_status():
+        async def get_status(request: Request):
             """Get comprehensive bot status"""
-            return await self._get_full_status()
+            return await self._cache.get(
+                "status", STATUS_CACHE_TTL, self._get_full_status,
+                request.headers.get("if-none-match")
+            )
         
         @self.app.get("/metrics")
-        async def get_metrics():
+        async def get_metrics(request: Request):
             """Get detailed metrics"""
-            return await self._get_metrics()
+            return await self._cache.get(
+                "metrics", METRICS_CACHE_TTL, self._get_metrics,
+                request.headers.get("if-none-match")
+            )
         
         @self.app.get("/trends")
         async def get_trends():
@@ -43,17 +102,17 @@ class EnhancedTracker:
             return await self._get_trend_info()
         
         @self.app.get("/dry-run")
-        async def dry_run(account: str = Query(..., regex="^(A|B|account_a|account_b)$")):
+        async def dry_run(account: Literal["A", "B", "account_a", "account_b"] = Query(...)):
             """Preview next tweet without posting"""
             return await self._dry_run_tweet(account)
         
         @self.app.post("/pause")
-        async def pause_account(account: str = Query(..., regex="^(A|B|all)$")):
+        async def pause_account(account: Literal["A", "B", "all"] = Query(...)):
             """Pause posting for specific account"""
             return await self._pause_account(account)
         
         @self.app.post("/resume")
-        async def resume_account(account: str = Query(..., regex="^(A|B|all)$")):
+        async def resume_account(account: Literal["A", "B", "all"] = Query(...)):
             """Resume posting for specific account"""
             return await self._resume_account(account)
         
@@ -70,20 +129,21 @@ class EnhancedTracker:
         @self.app.get("/health")
         async def health_check():
             """Health check endpoint"""
-            return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+            return health_response()
     
     async def _get_full_status(self) -> Dict:
         """Get comprehensive status information"""
         
-        # Get trend information
-        trend_info = await self._get_trend_source_info()
-        
-        # Get account status
-        account_a_status = await self._get_account_status("account_a")
-        account_b_status = await self._get_account_status("account_b")
+        # Get trend information and account status concurrently
+        trend_info, account_a_status, account_b_status = await asyncio.gather(
+            self._get_trend_source_info(),
+            self._get_account_status("account_a"),
+            self._get_account_status("account_b")
+        )
         
-        # Get angle distribution
+        # File-backed stats come from the in-memory snapshot
         angle_dist = self._get_angle_distribution()
+        price_age = self._get_price_age()
         
         # Get CTR estimates (would need real data in production)
         ctr_by_angle = self._get_ctr_by_angle()
@@ -114,8 +174,8 @@ class EnhancedTracker:
             },
             
             "pricing": {
-                "data_age_hours": self._get_price_age(),
-                "using_fresh_prices": self._get_price_age() < 24 if self._get_price_age() else False
+                "data_age_hours": price_age,
+                "using_fresh_prices": price_age < 24 if price_age else False
             },
             
             "performance": {
@@ -129,8 +189,8 @@ class EnhancedTracker:
     async def _get_metrics(self) -> Dict:
         """Get detailed performance metrics"""
         
-        # Database metrics
-        db_stats = self._get_database_stats()
+        # Database metrics (size comes from the snapshot's last stat)
+        db_stats = self._get_database_stats(self._snap.db_size_mb)
         
         # Posting metrics
         posting_stats = self._get_posting_stats()
@@ -173,19 +233,15 @@ class EnhancedTracker:
     
     async def _dry_run_tweet(self, account: str) -> Dict:
         """Generate preview of next tweet without posting"""
-        
-        # Import necessary components
-        from app.composer_optimized import OptimizedComposer
-        from app.trends_filter import TrendFilter, PulsedTrendExtractor
-        
+        # Per request: the composer's angle rotation is mutable state, and concurrent
+        # dry runs would otherwise interleave across the awaits below
         composer = OptimizedComposer()
-        filter = TrendFilter()
         
         # Get current trends
         trends = await self._get_current_trends()
         
         # Filter and score
-        filtered = await filter.filter_and_score(trends)
+        filtered = await self._filter.filter_and_score(trends)
         
         if not filtered:
             return {
@@ -219,37 +275,32 @@ class EnhancedTracker:
     
     async def _pause_account(self, account: str) -> Dict:
         """Pause posting for account"""
-        if account == "all":
-            self.paused_accounts.update(["A", "B"])
-            message = "All accounts paused"
-        else:
-            self.paused_accounts.add(account)
-            message = f"Account {account} paused"
+        self._paused_mask |= ACCOUNT_BITS[account]
+        message = "All accounts paused" if account == "all" else f"Account {account} paused"
+        self._cache.invalidate("status")
         
         return {
             "status": "success",
             "message": message,
-            "paused_accounts": list(self.paused_accounts)
+            "paused_accounts": PAUSED_LISTS[self._paused_mask]
         }
     
     async def _resume_account(self, account: str) -> Dict:
         """Resume posting for account"""
-        if account == "all":
-            self.paused_accounts.clear()
-            message = "All accounts resumed"
-        else:
-            self.paused_accounts.discard(account)
-            message = f"Account {account} resumed"
+        self._paused_mask &= ~ACCOUNT_BITS[account]
+        message = "All accounts resumed" if account == "all" else f"Account {account} resumed"
+        self._cache.invalidate("status")
         
         return {
             "status": "success",
             "message": message,
-            "paused_accounts": list(self.paused_accounts)
+            "paused_accounts": PAUSED_LISTS[self._paused_mask]
         }
     
     async def _set_cooldown(self, minutes: int) -> Dict:
         """Set emergency cooldown"""
         self.cooldown_until = datetime.now() + timedelta(minutes=minutes)
+        self._cache.invalidate("status")
         
         return {
             "status": "success",
@@ -271,30 +322,13 @@ class EnhancedTracker:
     
     async def _get_trend_source_info(self) -> Dict:
         """Get information about trend sources"""
-        # Check various trend cache files
-        sources = []
-        ages = []
-        
-        files = [
-            ("data/pulsed_trends.json", "X_SEARCH"),
-            ("data/realtime_trends.json", "PYTRENDS"),
-            ("data/trends_cache.json", "SEMANTIC")
+        # Ages are computed now; the file contents come from the snapshot
+        now = datetime.now()
+        sources = [
+            (source_name, (now - ts).total_seconds() / 60)
+            for source_name, ts in self._snap.trend_timestamps
         ]
         
-        for file_path, source_name in files:
-            path = Path(file_path)
-            if path.exists():
-                try:
-                    with open(path) as f:
-                        data = json.load(f)
-                        if "timestamp" in data:
-                            ts = datetime.fromisoformat(data["timestamp"])
-                            age = (datetime.now() - ts).total_seconds() / 60
-                            sources.append((source_name, age))
-                            ages.append(age)
-                except:
-                    pass
-        
         # Determine primary source
         if sources:
             sources.sort(key=lambda x: x[1])  # Sort by age
@@ -304,29 +338,12 @@ class EnhancedTracker:
             primary_source = "NONE"
             min_age = 999999
         
-        # Load actual trends
-        trends = []
-        relevance_scores = {}
-        
-        try:
-            # Try to load most recent trends
-            for file_path, _ in files:
-                path = Path(file_path)
-                if path.exists():
-                    with open(path) as f:
-                        data = json.load(f)
-                        if "trends" in data:
-                            trends = data["trends"][:10]
-                            break
-        except:
-            pass
-        
         return {
             "source": primary_source,
             "age_minutes": int(min_age),
             "has_real_trend": min_age < 360,  # Less than 6 hours old
-            "top_trends": trends,
-            "relevance_scores": relevance_scores
+            "top_trends": self._snap.trends[:10],
+            "relevance_scores": {}
         }
     
     async def _get_account_status(self, account: str) -> Dict:
@@ -342,7 +359,7 @@ class EnhancedTracker:
             next_run = datetime.now()
         
         return {
-            "paused": account in self.paused_accounts,
+            "paused": bool(self._paused_mask & ACCOUNT_BITS[account]),
             "posts_today": posts_today,
             "posts_remaining": 10 - posts_today,
             "last_post": last_post.isoformat() if last_post else None,
@@ -352,22 +369,7 @@ class EnhancedTracker:
     
     def _get_angle_distribution(self) -> Dict[str, int]:
         """Get angle usage distribution"""
-        try:
-            path = Path("data/angle_stats.json")
-            if path.exists():
-                with open(path) as f:
-                    return json.load(f)
-        except:
-            pass
-        
-        return {
-            "cost": 0,
-            "latency": 0,
-            "autoscale": 0,
-            "regions": 0,
-            "uptime": 0,
-            "support": 0
-        }
+        return self._snap.angle_distribution
     
     def _get_ctr_by_angle(self) -> Dict[str, float]:
         """Get CTR by angle (mock data for now)"""
@@ -382,30 +384,15 @@ class EnhancedTracker:
         }
     
     def _get_next_angle(self) -> str:
-        """Get next angle in rotation"""
-        angles = ["cost", "latency", "autoscale", "regions", "uptime", "support"]
-        dist = self._get_angle_distribution()
-        
-        # Find least used
-        min_count = min(dist.values()) if dist else 0
-        for angle in angles:
-            if dist.get(angle, 0) == min_count:
-                return angle
-        
-        return angles[0]
+        """Get next angle in rotation (least used, precomputed in the snapshot)"""
+        return self._snap.next_angle
     
     def _get_price_age(self) -> Optional[float]:
         """Get age of price data in hours"""
-        try:
-            path = Path("data/offers.json")
-            if path.exists():
-                with open(path) as f:
-                    data = json.load(f)
-                    ts = datetime.fromisoformat(data["timestamp"])
-                    return (datetime.now() - ts).total_seconds() / 3600
-        except:
-            pass
-        return None
+        offers_ts = self._snap.offers_timestamp
+        if offers_ts is None:
+            return None
+        return (datetime.now() - offers_ts).total_seconds() / 3600
     
     def _get_posts_today(self) -> int:
         """Get total posts today"""
@@ -427,12 +414,12 @@ class EnhancedTracker:
         # Would track actual response times
         return 245.6  # Mock 245ms
     
-    def _get_database_stats(self) -> Dict:
+    def _get_database_stats(self, db_size: float) -> Dict:
         """Get database statistics"""
         return {
             "total_posts": self.store.get_total_posts(),
             "unique_tweets": self.store.get_unique_tweets(),
-            "database_size_mb": self._get_db_size(),
+            "database_size_mb": db_size,
             "last_cleanup": self.store.get_last_cleanup()
         }
     
@@ -462,21 +449,18 @@ class EnhancedTracker:
     
     def _get_memory_usage(self) -> float:
         """Get memory usage in MB"""
-        import psutil
-        process = psutil.Process()
-        return process.memory_info().rss / 1024 / 1024
+        return self._proc.memory_info().rss / 1024 / 1024
     
     def _get_cpu_usage(self) -> float:
-        """Get CPU usage percentage"""
-        import psutil
-        return psutil.cpu_percent(interval=1)
+        """Get CPU usage percentage since the previous call (non-blocking)"""
+        return psutil.cpu_percent(interval=None)
     
     def _get_db_size(self) -> float:
-        """Get database size in MB"""
-        db_path = Path("data/bot.db")
-        if db_path.exists():
-            return db_path.stat().st_size / 1024 / 1024
-        return 0
+        """Get database size in MB (blocking; called when the snapshot refreshes)"""
+        try:
+            return Path("data/bot.db").stat().st_size / 1024 / 1024
+        except OSError:
+            return 0
     
     def _is_within_window(self) -> bool:
         """Check if within posting window"""
@@ -486,37 +470,95 @@ class EnhancedTracker:
     
     def _get_account_posts_today(self, account: str) -> int:
         """Get posts today for specific account"""
-        # Would query database
-        return random.randint(3, 7)  # Mock data
+        return self._snap.accounts.get(STORE_ACCOUNTS[account], {}).get('posts_today', 0)
     
     def _get_last_post_time(self, account: str) -> Optional[datetime]:
         """Get last post time for account"""
-        # Would query database
-        return datetime.now() - timedelta(minutes=random.randint(30, 120))
+        return self._snap.last_post_times.get(STORE_ACCOUNTS[account])
     
     async def _get_current_trends(self) -> List[str]:
         """Get current trends from cache"""
+        trends = self._snap.trends
+        return trends if trends else ["#AI", "#GPU", "#CloudCompute"]
+    
+    async def _refresh_snapshots(self):
+        """Reload the data file and per-account snapshot periodically"""
+        while True:
+            try:
+                snap = await asyncio.to_thread(self._load_all)
+            except Exception:
+                snap = self._snap
+            try:
+                snap.accounts = await self.store.get_status_bundle()
+                snap.last_post_times = {
+                    account: datetime.fromisoformat(stats['last_post_time'])
+                    for account, stats in snap.accounts.items()
+                    if stats.get('last_post_time')
+                }
+            except Exception:
+                # Keep the previous per-account figures if the store is unavailable
+                snap.accounts = self._snap.accounts
+                snap.last_post_times = self._snap.last_post_times
+            self._snap = snap
+            await asyncio.sleep(SNAPSHOT_REFRESH_SECONDS)
+    
+    def _load_all(self) -> SimpleNamespace:
+        """Read every data file the tracker reports on (blocking; run in a thread)"""
+        trend_timestamps = []
         trends = []
-        
-        files = [
-            "data/pulsed_trends.json",
-            "data/realtime_trends.json",
-            "data/trends_cache.json"
-        ]
-        
-        for file_path in files:
-            path = Path(file_path)
-            if path.exists():
+        for file_path, source_name in TREND_FILES:
+            data = self._load_json(file_path)
+            if not data or not isinstance(data, dict):
+                continue
+            if "timestamp" in data:
                 try:
-                    with open(path) as f:
-                        data = json.load(f)
-                        if "trends" in data:
-                            trends = data["trends"]
-                            break
-                except:
+                    trend_timestamps.append((source_name, datetime.fromisoformat(data["timestamp"])))
+                except (TypeError, ValueError):
                     pass
+            if not trends and "trends" in data:
+                trends = data["trends"]
         
-        return trends if trends else ["#AI", "#GPU", "#CloudCompute"]
+        angle_distribution = self._load_json("data/angle_stats.json")
+        if not isinstance(angle_distribution, dict):
+            angle_distribution = DEFAULT_ANGLE_DISTRIBUTION
+        
+        offers_timestamp = None
+        offers = self._load_json("data/offers.json")
+        try:
+            offers_timestamp = datetime.fromisoformat(offers["timestamp"])
+        except (TypeError, KeyError, ValueError):
+            pass
+        
+        return SimpleNamespace(
+            trend_timestamps=trend_timestamps,
+            trends=trends,
+            angle_distribution=angle_distribution,
+            next_angle=min(ANGLES, key=lambda angle: angle_distribution.get(angle, 0)),
+            offers_timestamp=offers_timestamp,
+            db_size_mb=self._get_db_size(),
+            # Filled from the store by _refresh_snapshots
+            accounts={},
+            last_post_times={}
+        )
+    
+    def _load_json(self, file_path: str):
+        """Load a JSON file, reusing the parsed copy while its mtime is unchanged"""
+        try:
+            mtime = os.stat(file_path).st_mtime_ns
+        except OSError:
+            self._json_cache.pop(file_path, None)
+            return None
+        
+        cached = self._json_cache.get(file_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        try:
+            data = loads_json(Path(file_path).read_bytes())
+        except Exception:
+            data = None
+        self._json_cache[file_path] = (mtime, data)
+        return data
     
     async def run(self, host: str = "0.0.0.0", port: int = 8000):
         """Run the tracker API"""
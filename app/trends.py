@@ -4,55 +4,119 @@ Zero hardcoded hashtags - all dynamically generated from current trends.
 """
 
 import asyncio
+import heapq
 import re
 import logging
-from typing import List, Dict, Set, Optional, Tuple
+from typing import List, Dict
 from datetime import datetime, timedelta
 import random
-from collections import Counter
-import aiohttp
+from collections import Counter, defaultdict, deque
 
 try:
     from pytrends.request import TrendReq
 except ImportError:
     TrendReq = None
 
-from langdetect import detect, LangDetectException
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 import tweepy
 from .config import Config
 from .store import Store
 
 logger = logging.getLogger(__name__)
 
+# Accepted hashtag length, '#' included; producers skip anything outside it
+MIN_HASHTAG_LENGTH = 3
+MAX_HASHTAG_LENGTH = 30
+
+# One bit per trend source, so a hashtag's sources fold into an int
+_SOURCE_BITS = {'twitter': 1, 'google': 2, 'semantic': 4}
+
+# Word splitter for converting topics to hashtags
+_WORD_RE = re.compile(r'\w+')
+
+# Topic words that also get their own hashtag
+_TECH_TERMS = frozenset({
+    'ai', 'gpu', 'cloud', 'tech', 'data', 'compute',
+    'machine', 'learning', 'neural', 'network', 'server',
+    'infrastructure', 'scale', 'performance', 'latency'
+})
+
 
 class TrendsManager:
     """Manages trend extraction from multiple sources with zero hardcoded hashtags."""
     
-    NSFW_KEYWORDS = {
+    NSFW_KEYWORDS = frozenset({
         'porn', 'xxx', 'nsfw', 'nude', 'sex', 'onlyfans', 'adult',
         'escort', 'fetish', 'bdsm', 'milf', 'boobs', 'ass', 'dick'
-    }
+    })
     
-    POLITICAL_KEYWORDS = {
+    POLITICAL_KEYWORDS = frozenset({
         'trump', 'biden', 'democrat', 'republican', 'maga', 'liberal',
         'conservative', 'election', 'vote', 'politics', 'congress',
         'senate', 'president', 'governor', 'campaign', 'ballot'
-    }
+    })
+    
+    BLOCKED_KEYWORDS = NSFW_KEYWORDS | POLITICAL_KEYWORDS
+    
+    # Both keyword sets as one pattern, so each hashtag is scanned once
+    # (used when pyahocorasick isn't installed)
+    _BLOCK_RE = re.compile('|'.join(map(re.escape, sorted(BLOCKED_KEYWORDS))))
     
     REGIONS = ['united_states', 'united_kingdom', 'france', 'germany', 
                'spain', 'italy', 'brazil', 'india', 'japan', 'south_korea']
     
+    # Semantic hashtag groups used when live sources come up short
+    SEMANTIC_CONTEXTS = [
+        ('gpu_computing', ['GPU', 'CloudCompute', 'HPC']),
+        ('ai_infrastructure', ['AIInfrastructure', 'MLOps', 'DeepLearning']),
+        ('cloud_services', ['CloudServices', 'IaaS', 'OnDemand']),
+        ('performance', ['HighPerformance', 'LowLatency', 'Scalable']),
+        ('cost_efficiency', ['CostEffective', 'PayAsYouGo', 'Affordable']),
+        ('innovation', ['TechInnovation', 'NextGen', 'FutureTech'])
+    ]
+    
+    # Number of top-scored trends kept after each refresh
+    MAX_CACHED_TRENDS = 20
+    
+    # Regions queried per Google Trends refresh
+    GOOGLE_REGIONS = REGIONS[:3]
+    
     def __init__(self, config: Config, store: Store):
         self.config = config
         self.store = store
         self.twitter_client = None
-        self.pytrends = self._init_pytrends() if TrendReq else None
+        # Created on first Google Trends fetch; TrendReq() does network IO
+        self._pytrends = None
+        # One PyTrends client per region, since regions are fetched in parallel threads
+        self._region_pytrends = {}
         self.last_refresh = None
         self.cached_trends = []
         # Circuit breaker for PyTrends
         self.pytrends_degraded_until = None
         self.pytrends_fail_count = 0
+        self._blocked = self._build_block_matcher()
+        # Last _score_trends input (hashtag, source, score, timestamp per trend) and its
+        # per-hashtag aggregates
+        self._score_cache_key = None
+        self._score_cache_val = None
+        # API reads made during a refresh, written to the store once at its end
+        self._pending_api_reads = Counter()
+        # Shuffled rings for semantic contexts and the trend pool; each item is drawn once per pass
+        self._context_ring = deque()
+        self._trend_ring = deque()
+        self._trend_ring_pool = None
         
+    @property
+    def pytrends(self):
+        """PyTrends client, created on first access (blocking)."""
+        if self._pytrends is None and TrendReq:
+            self._pytrends = self._init_pytrends()
+        return self._pytrends
+    
     def set_twitter_client(self, client):
         """Set Twitter client for search operations."""
         self.twitter_client = client
@@ -73,7 +137,7 @@ class TrendsManager:
                     logger.info(f"Extracted {len(twitter_trends)} trends from Twitter")
             
             # 2. Fallback to Google Trends if needed
-            if len(trends) < 10 and self.pytrends:
+            if len(trends) < 10 and TrendReq:
                 google_trends = await self._extract_google_trends()
                 if google_trends:
                     trends.extend(google_trends)
@@ -91,7 +155,7 @@ class TrendsManager:
             
             # Store in database
             await self.store.update_trends(scored_trends)
-            self.cached_trends = scored_trends[:20]  # Keep top 20
+            self.cached_trends = scored_trends
             self.last_refresh = datetime.now()
             
             logger.info(f"Trend refresh complete: {len(self.cached_trends)} trends cached")
@@ -100,6 +164,19 @@ class TrendsManager:
         except Exception as e:
             logger.error(f"Error refreshing trends: {e}")
             return self.cached_trends or []
+        
+        finally:
+            await self._flush_api_reads()
+    
+    async def _flush_api_reads(self):
+        """Write the API reads buffered during this refresh in one batch."""
+        if not self._pending_api_reads:
+            return
+        try:
+            await self.store.record_api_reads_bulk(self._pending_api_reads)
+            self._pending_api_reads.clear()
+        except Exception as e:
+            logger.error(f"Error recording API reads: {e}")
     
     async def _extract_twitter_trends(self) -> List[Dict]:
         """Extract trends from recent Twitter posts."""
@@ -112,49 +189,69 @@ class TrendsManager:
             return trends
         
         # Check daily read quota
-        reads_today = await self.store.get_reads_today()
+        reads_today = await self.store.get_reads_today() + sum(self._pending_api_reads.values())
         if reads_today >= self.config.MAX_READS_PER_DAY:
             logger.warning(f"Daily read limit reached ({reads_today}/{self.config.MAX_READS_PER_DAY})")
             return trends
         
+        # Each page is one read, so never page past the daily quota
+        pages = min(self.config.TWITTER_SEARCH_PAGES, self.config.MAX_READS_PER_DAY - reads_today)
+        pages_fetched = 0
+        
         try:
             # Fixed query - must have content before operators
             query = "#AI OR #GPU OR #CloudComputing OR #MachineLearning lang:en -is:retweet -is:reply"
             
-            # Use bearer token client for search
-            tweets = self.twitter_client.search_recent_tweets(
+            # Page the wrapper's bearer token client directly, in a worker thread: Paginator
+            # passes next_token and needs a real Response, which TwitterClient doesn't support
+            paginator = iter(tweepy.Paginator(
+                self.twitter_client.bearer_client.search_recent_tweets,
                 query=query,
-                max_results=30,  # Reduced to save API calls
-                tweet_fields=['created_at', 'entities']
-            )
-            
-            # Record API read
-            await self.store.record_api_read('twitter_search')
+                max_results=100,
+                tweet_fields=['created_at', 'entities'],
+                limit=pages
+            ))
             
-            if not tweets.data:
-                return trends
-            
-            # Extract hashtags with frequency
+            # Extract hashtags with frequency, page by page
+            now = datetime.now()
             hashtag_counter = Counter()
-            cutoff_time = datetime.now() - timedelta(minutes=60)
             
-            for tweet in tweets.data:
-                if tweet.entities and 'hashtags' in tweet.entities:
-                    for tag in tweet.entities['hashtags']:
-                        hashtag = f"#{tag['tag']}"
-                        hashtag_counter[hashtag] += 1
+            while True:
+                # A failed page ends paging; the pages already fetched still count
+                try:
+                    page = await asyncio.to_thread(next, paginator, None)
+                except tweepy.TooManyRequests:
+                    logger.warning("Rate limit exceeded for Twitter trend search")
+                    break
+                except Exception as e:
+                    logger.error(f"Error fetching Twitter search page: {e}")
+                    break
+                if page is None:
+                    break
+                pages_fetched += 1
+                hashtag_counter.update(
+                    hashtag
+                    for tweet in page.data or ()
+                    for tag in (tweet.entities or {}).get('hashtags', ())
+                    if MIN_HASHTAG_LENGTH <= len(hashtag := f"#{tag['tag']}") <= MAX_HASHTAG_LENGTH
+                )
             
             # Convert to trend format
             for hashtag, count in hashtag_counter.most_common(30):
                 trends.append({
                     'hashtag': hashtag,
+                    'hashtag_lower': hashtag.casefold(),
                     'source': 'twitter',
                     'score': count,
-                    'timestamp': datetime.now()
+                    'timestamp': now
                 })
                 
         except Exception as e:
             logger.error(f"Error extracting Twitter trends: {e}")
+        finally:
+            # Buffer API reads; refresh_trends flushes them
+            if pages_fetched:
+                self._pending_api_reads['twitter_search'] += pages_fetched
             
         return trends
     
@@ -198,37 +295,34 @@ class TrendsManager:
         
         try:
             success_count = 0
-            for region in self.REGIONS[:3]:  # Reduce to 3 regions
-                try:
-                    # Try realtime trends first
-                    trending = None
-                    try:
-                        trending = self.pytrends.realtime_trending_searches(pn=region[:2].upper())
-                    except:
-                        # Fallback to regular trending
-                        trending = self.pytrends.trending_searches(pn=region)
-                    
-                    if trending is not None and not trending.empty:
-                        for topic in trending[0][:10]:  # Top 10 per region
-                            # Convert topic to hashtags
-                            hashtags = self._topic_to_hashtags(str(topic))
-                            for hashtag in hashtags:
-                                trends.append({
-                                    'hashtag': hashtag,
-                                    'source': 'google',
-                                    'score': 1,
-                                    'timestamp': datetime.now()
-                                })
-                    
-                    await asyncio.sleep(1)  # Rate limiting
-                    
-                    success_count += 1
-                    
-                except Exception as e:
+            # Regions are independent requests, so fetch them concurrently
+            results = await asyncio.gather(
+                *(asyncio.to_thread(self._fetch_region_trends, region) for region in self.GOOGLE_REGIONS),
+                return_exceptions=True
+            )
+            now = datetime.now()
+            
+            for region, trending in zip(self.GOOGLE_REGIONS, results):
+                if isinstance(trending, Exception):
                     # Only log first failure per region
                     if self.pytrends_fail_count == 0:
-                        logger.info(f"PyTrends unavailable for {region}: {e}")
+                        logger.info(f"PyTrends unavailable for {region}: {trending}")
                     continue
+                
+                if trending is not None and not trending.empty:
+                    for topic in trending[0][:10]:  # Top 10 per region
+                        # Convert topic to hashtags
+                        hashtags = self._topic_to_hashtags(str(topic))
+                        for hashtag in hashtags:
+                            trends.append({
+                                'hashtag': hashtag,
+                                'hashtag_lower': hashtag.casefold(),
+                                'source': 'google',
+                                'score': 1,
+                                'timestamp': now
+                            })
+                
+                success_count += 1
             
             # If all regions failed, activate circuit breaker
             if success_count == 0:
@@ -242,74 +336,83 @@ class TrendsManager:
             
         return trends
     
+    def _fetch_region_trends(self, region: str):
+        """Fetch trending searches for one region (blocking; run in a thread)."""
+        client = self._region_pytrends.get(region)
+        if client is None:
+            # The first region shares the main client
+            client = self.pytrends if region == self.GOOGLE_REGIONS[0] else self._init_pytrends()
+            self._region_pytrends[region] = client
+            if client is None:
+                raise RuntimeError("PyTrends client unavailable")
+        
+        # Try realtime trends first
+        try:
+            return client.realtime_trending_searches(pn=region[:2].upper())
+        except:
+            # Fallback to regular trending
+            return client.trending_searches(pn=region)
+    
     def _topic_to_hashtags(self, topic: str) -> List[str]:
         """Convert a topic string to relevant hashtags."""
         hashtags = []
         
         # Clean and split topic
-        words = re.findall(r'\w+', topic.lower())
+        words = _WORD_RE.findall(topic.lower())
         
-        # Create CamelCase hashtag
+        # Create CamelCase hashtag (words are already lowercase, so only the first letter changes)
         if len(words) > 0:
-            camel_case = ''.join(word.capitalize() for word in words[:3])
-            hashtags.append(f"#{camel_case}")
-        
-        # Add individual word hashtags for important terms
-        tech_terms = {'ai', 'gpu', 'cloud', 'tech', 'data', 'compute', 
-                     'machine', 'learning', 'neural', 'network', 'server',
-                     'infrastructure', 'scale', 'performance', 'latency'}
+            camel_case = ''.join(word[:1].upper() + word[1:] for word in words[:3])
+            if MIN_HASHTAG_LENGTH <= len(camel_case) + 1 <= MAX_HASHTAG_LENGTH:
+                hashtags.append(f"#{camel_case}")
         
+        # Add individual word hashtags for important terms, up to 3 hashtags per topic
         for word in words:
-            if word in tech_terms and len(word) > 2:
-                hashtags.append(f"#{word.capitalize()}")
+            if len(hashtags) >= 3:
+                break
+            if word in _TECH_TERMS and len(word) > 2:
+                hashtags.append(f"#{word[:1].upper()}{word[1:]}")
         
-        return hashtags[:3]  # Max 3 hashtags per topic
+        return hashtags
     
     def _generate_semantic_hashtags(self) -> List[Dict]:
         """Generate semantic hashtags related to GPU/cloud computing."""
         trends = []
         
-        # Dynamic semantic generation based on current context
-        contexts = [
-            ('gpu_computing', ['GPU', 'CloudCompute', 'HPC']),
-            ('ai_infrastructure', ['AIInfrastructure', 'MLOps', 'DeepLearning']),
-            ('cloud_services', ['CloudServices', 'IaaS', 'OnDemand']),
-            ('performance', ['HighPerformance', 'LowLatency', 'Scalable']),
-            ('cost_efficiency', ['CostEffective', 'PayAsYouGo', 'Affordable']),
-            ('innovation', ['TechInnovation', 'NextGen', 'FutureTech'])
-        ]
-        
-        # Randomly select contexts to avoid repetition
-        selected = random.sample(contexts, min(3, len(contexts)))
+        # Rotate through contexts in shuffled order to avoid repetition
+        selected = self._draw(self._context_ring, self.SEMANTIC_CONTEXTS, 3)
+        now = datetime.now()
         
         for context_name, hashtags in selected:
             for hashtag in hashtags:
                 trends.append({
                     'hashtag': f"#{hashtag}",
+                    'hashtag_lower': f"#{hashtag.casefold()}",
                     'source': 'semantic',
                     'score': 0.5,
-                    'timestamp': datetime.now()
+                    'timestamp': now
                 })
         
         return trends
     
+    def _build_block_matcher(self):
+        """Build the blocked-keyword matcher: an Aho-Corasick automaton if available, else the regex."""
+        if ahocorasick is None:
+            return self._BLOCK_RE.search
+        
+        automaton = ahocorasick.Automaton()
+        for word in self.BLOCKED_KEYWORDS:
+            automaton.add_word(word, word)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None)
+    
     def _filter_trends(self, trends: List[Dict]) -> List[Dict]:
-        """Filter out NSFW and sensitive political content."""
+        """Filter out NSFW and sensitive political content (lengths are checked by the producers)."""
         filtered = []
         
         for trend in trends:
-            hashtag_lower = trend['hashtag'].lower()
-            
-            # Check for NSFW content
-            if any(nsfw in hashtag_lower for nsfw in self.NSFW_KEYWORDS):
-                continue
-                
-            # Check for political content
-            if any(pol in hashtag_lower for pol in self.POLITICAL_KEYWORDS):
-                continue
-                
-            # Check for minimum length
-            if len(trend['hashtag']) < 3 or len(trend['hashtag']) > 30:
+            # Check for NSFW or political content (hashtag_lower is set by the extractors)
+            if self._blocked(trend['hashtag_lower']):
                 continue
                 
             filtered.append(trend)
@@ -317,30 +420,34 @@ class TrendsManager:
         return filtered
     
     def _score_trends(self, trends: List[Dict]) -> List[Dict]:
-        """Score trends based on freshness and relevance."""
-        scored = []
+        """Score trends based on freshness and relevance, returning the top MAX_CACHED_TRENDS."""
+        # Identical input to the last call (e.g. back-to-back refreshes) aggregates the same;
+        # time decay below still depends on the clock, so it's recomputed every call
+        key = tuple((t['hashtag'], t['source'], t['score'], t['timestamp']) for t in trends)
+        if key == self._score_cache_key:
+            hashtag_groups = self._score_cache_val
+        else:
+            # Group by hashtag and aggregate scores
+            hashtag_groups = defaultdict(lambda: {'source_mask': 0, 'total_score': 0, 'timestamp': None})
+            for trend in trends:
+                group = hashtag_groups[trend['hashtag']]
+                if group['timestamp'] is None:
+                    group['timestamp'] = trend['timestamp']
+                group['source_mask'] |= _SOURCE_BITS[trend['source']]
+                group['total_score'] += trend['score']
+            self._score_cache_key = key
+            self._score_cache_val = hashtag_groups
         
-        # Group by hashtag and aggregate scores
-        hashtag_groups = {}
-        for trend in trends:
-            hashtag = trend['hashtag']
-            if hashtag not in hashtag_groups:
-                hashtag_groups[hashtag] = {
-                    'hashtag': hashtag,
-                    'sources': [],
-                    'total_score': 0,
-                    'timestamp': trend['timestamp']
-                }
-            hashtag_groups[hashtag]['sources'].append(trend['source'])
-            hashtag_groups[hashtag]['total_score'] += trend['score']
+        scored = []
         
         # Calculate final scores
+        now = datetime.now()
         for hashtag, data in hashtag_groups.items():
             # Boost score for multiple sources
-            source_multiplier = len(set(data['sources']))
+            source_multiplier = data['source_mask'].bit_count()
             
             # Time decay factor (newer is better)
-            age_hours = (datetime.now() - data['timestamp']).total_seconds() / 3600
+            age_hours = (now - data['timestamp']).total_seconds() / 3600
             time_factor = max(0.5, 1 - (age_hours / 24))
             
             final_score = data['total_score'] * source_multiplier * time_factor
@@ -348,12 +455,17 @@ class TrendsManager:
             scored.append({
                 'hashtag': hashtag,
                 'score': final_score,
-                'sources': list(set(data['sources'])),
+                'sources': data['source_mask'],
                 'timestamp': data['timestamp']
             })
         
-        # Sort by score
-        scored.sort(key=lambda x: x['score'], reverse=True)
+        # Keep only the top trends, best first
+        scored = heapq.nlargest(self.MAX_CACHED_TRENDS, scored, key=lambda x: x['score'])
+        
+        # Expand source masks back to names for the survivors only
+        for trend in scored:
+            mask = trend['sources']
+            trend['sources'] = [source for source, bit in _SOURCE_BITS.items() if mask & bit]
         
         return scored
     
@@ -369,12 +481,29 @@ class TrendsManager:
             return []
         
         # Take top trends but add some randomization
-        pool_size = min(10, len(self.cached_trends))
-        pool = self.cached_trends[:pool_size]
+        if self._trend_ring_pool is not self.cached_trends:
+            # New refresh result: start a fresh rotation
+            self._trend_ring.clear()
+            self._trend_ring_pool = self.cached_trends
+        pool = self.cached_trends[:10]
         
-        selected = random.sample(pool, min(count, len(pool)))
+        selected = self._draw(self._trend_ring, pool, count)
         return [trend['hashtag'] for trend in selected]
     
+    @staticmethod
+    def _draw(ring: deque, pool: List, k: int) -> List:
+        """Take k distinct items from a shuffled ring over pool, reshuffling when it runs out."""
+        picked = []
+        while len(picked) < min(k, len(pool)):
+            if not ring:
+                shuffled = list(pool)
+                random.shuffle(shuffled)
+                ring.extend(shuffled)
+            item = ring.popleft()
+            if item not in picked:
+                picked.append(item)
+        return picked
+    
     def get_trend_samples(self) -> List[str]:
         """Get sample of current trends for status display."""
         if not self.cached_trends:
@@ -3,27 +3,114 @@ Enhanced trends extraction with multiple sources, caching, and relevance scoring
 """
 
 import asyncio
+import os
 import re
 import logging
-import json
 import hashlib
-from typing import List, Dict, Set, Optional, Tuple
+import pickle
+from typing import Callable, List, Dict, Set, Optional, Tuple
 from datetime import datetime, timedelta
 import random
-from collections import Counter
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
 import aiohttp
 from pathlib import Path
 import numpy as np
+import sklearn
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 
 from langdetect import detect, LangDetectException
 import tweepy
 from .config import Config
 from .store import Store
+from .json_logger import dumps_json, loads_json
 
 logger = logging.getLogger(__name__)
 
+# Cleaned hashtags whose relevance score is memoized (least recently used evicted first)
+RELEVANCE_CACHE_SIZE = 4096
+
+# Direct-match relevance keywords, each worth 0.3 when found anywhere in a hashtag
+RELEVANCE_KEYWORDS = ['gpu', 'ai', 'cloud', 'compute', 'ml', 'deep', 'learning',
+                      'neural', 'kubernetes', 'docker', 'server', 'latency',
+                      'performance', 'scale', 'infrastructure', 'llm', 'model']
+
+# Score multiplier per trend source
+SOURCE_BOOST = {
+    'twitter': 1.2,
+    'github': 1.1,
+    'reddit': 1.0,
+    'news': 1.15,
+    'semantic': 0.8
+}
+
+# Simulated tech news topics (stand-in for NewsAPI)
+_TECH_TOPICS = (
+    "artificial intelligence", "machine learning", "cloud computing",
+    "GPU shortage", "NVIDIA earnings", "OpenAI", "Google Gemini",
+    "AWS updates", "Kubernetes", "serverless", "edge computing"
+)
+
+# Simulated subreddit hashtags (stand-in for the Reddit API)
+_SUBREDDIT_TOPICS = (
+    ("MachineLearning", ("#DeepLearning", "#NeuralNetworks")),
+    ("LocalLLaMA", ("#LLM", "#AIModels")),
+    ("selfhosted", ("#SelfHosted", "#CloudAlternative")),
+    ("kubernetes", ("#K8s", "#ContainerOrchestration")),
+    ("nvidia", ("#NVIDIA", "#GPUComputing"))
+)
+
+# Semantic fallback hashtag groups
+_SEMANTIC_CONTEXTS = (
+    ('gpu_computing', ('GPUComputing', 'CloudGPU', 'HPCCloud')),
+    ('ai_infrastructure', ('AIInfra', 'MLOps', 'DeepLearning')),
+    ('cloud_native', ('CloudNative', 'Serverless', 'K8s')),
+    ('performance', ('HighPerformance', 'LowLatency', 'FastCompute')),
+    ('cost_optimization', ('CostOptimized', 'PayPerUse', 'ElasticScale')),
+    ('innovation', ('TechInnovation', 'NextGenCompute', 'FutureCloud'))
+)
+
+# Ready-made '#' hashtags per semantic context, sampled whole by the fallback
+_SEMANTIC_POOL = tuple(tuple(f"#{hashtag}" for hashtag in hashtags) for _, hashtags in _SEMANTIC_CONTEXTS)
+
+
+@dataclass(slots=True)
+class Trend:
+    """A trend candidate, scored in place as it moves through a refresh."""
+    hashtag: str
+    source: str
+    score: float
+    timestamp: datetime
+    relevance_score: float = 0.0
+    final_score: float = 0.0
+    topic: Optional[str] = None
+    subreddit: Optional[str] = None
+    bridge_text: Optional[str] = None
+    
+    def to_dict(self) -> Dict:
+        """Plain dict for the cache file and the store, without unset optional fields."""
+        return {
+            name: value for name in self.__slots__
+            if (value := getattr(self, name)) is not None
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Trend':
+        """Rebuild a trend from its to_dict() form (timestamps as ISO strings)."""
+        trend = cls(**{name: data[name] for name in cls.__slots__ if name in data})
+        if isinstance(trend.timestamp, str):
+            trend.timestamp = datetime.fromisoformat(trend.timestamp)
+        return trend
+
+
+# Lookahead so overlapping keywords (e.g. 'ai' inside 'infrastructure') are all found
+_KEYWORD_RE = re.compile('(?=(' + '|'.join(map(re.escape, RELEVANCE_KEYWORDS)) + '))')
+
+# Distinct keyword hits at which the 0.3-per-hit keyword score reaches its 1.0 cap
+_KEYWORD_CAP_HITS = 4
+
 
 class EnhancedTrendsManager:
     """Advanced trend extraction with relevance scoring and caching."""
@@ -57,6 +144,12 @@ class EnhancedTrendsManager:
         "machine learning operations MLOps DevOps"
     ]
     
+    # Hashtag cleaning for relevance scoring: drop '#', '_' becomes a space
+    _CLEAN_TABLE = str.maketrans({'#': '', '_': ' '})
+    
+    # Both keyword sets as one pattern, so each hashtag is scanned once
+    _BLOCK_RE = re.compile('|'.join(map(re.escape, sorted(NSFW_KEYWORDS | POLITICAL_KEYWORDS))))
+    
     def __init__(self, config: Config, store: Store):
         self.config = config
         self.store = store
@@ -65,24 +158,97 @@ class EnhancedTrendsManager:
         self.cache_duration = timedelta(hours=2)
         self.last_refresh = None
         self.cached_trends = []
+        # Parsed cache file and the mtime it was read at
+        self._cache_mtime = None
+        self._cache_data = None
+        
+        # Relevance score per cleaned hashtag; the vectorizer never changes after fitting
+        self._relevance_cache: OrderedDict[str, float] = OrderedDict()
+        # Pooled HTTP session shared by the extractors, created on first use
+        self._session: Optional[aiohttp.ClientSession] = None
+        # In-flight refresh started by get_trending_hashtags, awaited by concurrent callers
+        self._refresh_task: Optional[asyncio.Task] = None
+        
+    @cached_property
+    def _tfidf(self) -> Tuple[TfidfVectorizer, object, Callable[[str], List[str]], Dict[str, int]]:
+        """Fitted vectorizer, transposed corpus vectors, tokenizer and vocabulary.
         
-        # Initialize TF-IDF vectorizer for relevance scoring
-        self.vectorizer = TfidfVectorizer(
+        Built on first use: hashtags with a strong keyword match never need them.
+        """
+        # TF-IDF vectorizer for relevance scoring, fitted once and reused across restarts
+        vectorizer, relevance_vectors = self._load_vectorizer()
+        return (
+            vectorizer,
+            # Unit-length corpus rows, transposed once: cosine similarity becomes a single matmul
+            # (transform() already L2-normalizes query rows, as norm='l2' is the vectorizer default)
+            normalize(relevance_vectors).T.tocsr(),
+            # Tokenizer + vocabulary, to skip transforming hashtags that share no term with the corpus
+            vectorizer.build_analyzer(),
+            vectorizer.vocabulary_
+        )
+    
+    def _load_vectorizer(self) -> Tuple[TfidfVectorizer, object]:
+        """Load the fitted vectorizer and corpus vectors from disk, fitting them on a miss."""
+        vectorizer = TfidfVectorizer(
             max_features=100,
             ngram_range=(1, 2),
-            stop_words='english'
+            stop_words='english',
+            dtype=np.float32  # similarities only rank hashtags; float32 halves the matrix traffic
         )
-        self.relevance_vectors = self.vectorizer.fit_transform(self.RELEVANCE_CORPUS)
         
+        # Any change to the corpus, the parameters or sklearn itself selects a new file
+        key = hashlib.blake2b(
+            repr((self.RELEVANCE_CORPUS, vectorizer.get_params(), sklearn.__version__)).encode('utf-8'),
+            digest_size=8
+        ).hexdigest()
+        vec_file = self.cache_file.parent / f"_relevance_vec_{key}.pkl"
+        
+        try:
+            return pickle.loads(vec_file.read_bytes())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Error loading relevance vectorizer: {e}")
+        
+        relevance_vectors = vectorizer.fit_transform(self.RELEVANCE_CORPUS)
+        try:
+            vec_file.parent.mkdir(exist_ok=True)
+            tmp_file = vec_file.with_suffix('.tmp')
+            tmp_file.write_bytes(pickle.dumps((vectorizer, relevance_vectors)))
+            os.replace(tmp_file, vec_file)
+        except Exception as e:
+            logger.warning(f"Error saving relevance vectorizer: {e}")
+        return vectorizer, relevance_vectors
+    
     def set_twitter_client(self, client):
         """Set Twitter client for search operations."""
         self.twitter_client = client
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, keeping connections alive across refreshes."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=30, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
         
-    async def refresh_trends(self) -> List[Dict]:
+    async def refresh_trends(self) -> List[Trend]:
         """
         Main trend refresh with caching and multiple sources.
         """
         try:
+            # Trends refreshed in this process are still current
+            if self.cached_trends and self.last_refresh and \
+               (datetime.now() - self.last_refresh) < self.cache_duration:
+                return self.cached_trends
+            
             # Check cache first
             cached = self._load_cache()
             if cached:
@@ -92,30 +258,25 @@ class EnhancedTrendsManager:
             
             trends = []
             
-            # 1. Try NewsAPI for tech news
-            news_trends = await self._extract_news_trends()
-            if news_trends:
-                trends.extend(news_trends)
-                logger.info(f"Extracted {len(news_trends)} trends from NewsAPI")
-            
-            # 2. Try Reddit tech subreddits
-            reddit_trends = await self._extract_reddit_trends()
-            if reddit_trends:
-                trends.extend(reddit_trends)
-                logger.info(f"Extracted {len(reddit_trends)} trends from Reddit")
+            # 1-4. NewsAPI, Reddit, GitHub and Twitter (if not in conservative mode),
+            # fetched concurrently since each is an independent network call
+            extractors = [
+                ("NewsAPI", self._extract_news_trends()),
+                ("Reddit", self._extract_reddit_trends()),
+                ("GitHub", self._extract_github_trends())
+            ]
+            if self.twitter_client and self.config.X_READS_MODE != 'conservative':
+                extractors.append(("Twitter", self._extract_twitter_trends()))
             
-            # 3. Try GitHub trending
-            github_trends = await self._extract_github_trends()
-            if github_trends:
-                trends.extend(github_trends)
-                logger.info(f"Extracted {len(github_trends)} trends from GitHub")
+            results = await asyncio.gather(*(coro for _, coro in extractors), return_exceptions=True)
             
-            # 4. Twitter search (if not in conservative mode)
-            if self.twitter_client and self.config.X_READS_MODE != 'conservative':
-                twitter_trends = await self._extract_twitter_trends()
-                if twitter_trends:
-                    trends.extend(twitter_trends)
-                    logger.info(f"Extracted {len(twitter_trends)} trends from Twitter")
+            for (source_name, _), source_trends in zip(extractors, results):
+                if isinstance(source_trends, BaseException):
+                    logger.warning(f"Error extracting {source_name} trends: {source_trends}")
+                    continue
+                if source_trends:
+                    trends.extend(source_trends)
+                    logger.info(f"Extracted {len(source_trends)} trends from {source_name}")
             
             # 5. Generate semantic hashtags as fallback
             if len(trends) < 5:
@@ -130,7 +291,7 @@ class EnhancedTrendsManager:
             # Only keep trends with sufficient relevance
             relevant_trends = [
                 t for t in scored_trends 
-                if t.get('relevance_score', 0) >= self.config.MIN_RELEVANCE_SCORE
+                if t.relevance_score >= self.config.MIN_RELEVANCE_SCORE
             ]
             
             if len(relevant_trends) < 3:
@@ -142,7 +303,7 @@ class EnhancedTrendsManager:
             self._save_cache(relevant_trends[:20])
             
             # Store in database
-            await self.store.update_trends(relevant_trends)
+            await self.store.update_trends([trend.to_dict() for trend in relevant_trends])
             self.cached_trends = relevant_trends[:20]
             self.last_refresh = datetime.now()
             
@@ -153,100 +314,90 @@ class EnhancedTrendsManager:
             logger.error(f"Error refreshing trends: {e}")
             return self.cached_trends or self._generate_semantic_hashtags()
     
-    async def _extract_news_trends(self) -> List[Dict]:
+    async def _extract_news_trends(self) -> List[Trend]:
         """Extract trends from tech news sources."""
         trends = []
         
         try:
             # Using NewsAPI (you'd need an API key in production)
             # For now, simulating with tech RSS feeds
-            tech_topics = [
-                "artificial intelligence", "machine learning", "cloud computing",
-                "GPU shortage", "NVIDIA earnings", "OpenAI", "Google Gemini",
-                "AWS updates", "Kubernetes", "serverless", "edge computing"
-            ]
-            
-            for topic in random.sample(tech_topics, min(5, len(tech_topics))):
+            now = datetime.now()
+            for topic in random.sample(_TECH_TOPICS, min(5, len(_TECH_TOPICS))):
                 hashtag = "#" + "".join(word.capitalize() for word in topic.split()[:2])
-                trends.append({
-                    'hashtag': hashtag,
-                    'source': 'news',
-                    'score': random.uniform(0.7, 1.0),
-                    'timestamp': datetime.now(),
-                    'topic': topic
-                })
+                trends.append(Trend(
+                    hashtag=hashtag,
+                    source='news',
+                    score=random.uniform(0.7, 1.0),
+                    timestamp=now,
+                    topic=topic
+                ))
                 
         except Exception as e:
             logger.warning(f"Error extracting news trends: {e}")
             
         return trends
     
-    async def _extract_reddit_trends(self) -> List[Dict]:
+    async def _extract_reddit_trends(self) -> List[Trend]:
         """Extract trends from Reddit tech subreddits."""
         trends = []
         
         try:
             # Simulating Reddit API (would use PRAW in production)
-            subreddit_topics = [
-                ("MachineLearning", ["#DeepLearning", "#NeuralNetworks"]),
-                ("LocalLLaMA", ["#LLM", "#AIModels"]),
-                ("selfhosted", ["#SelfHosted", "#CloudAlternative"]),
-                ("kubernetes", ["#K8s", "#ContainerOrchestration"]),
-                ("nvidia", ["#NVIDIA", "#GPUComputing"])
-            ]
-            
-            for subreddit, hashtags in random.sample(subreddit_topics, 3):
+            now = datetime.now()
+            for subreddit, hashtags in random.sample(_SUBREDDIT_TOPICS, 3):
                 for hashtag in hashtags:
-                    trends.append({
-                        'hashtag': hashtag,
-                        'source': 'reddit',
-                        'score': random.uniform(0.6, 0.9),
-                        'timestamp': datetime.now(),
-                        'subreddit': subreddit
-                    })
+                    trends.append(Trend(
+                        hashtag=hashtag,
+                        source='reddit',
+                        score=random.uniform(0.6, 0.9),
+                        timestamp=now,
+                        subreddit=subreddit
+                    ))
                     
         except Exception as e:
             logger.warning(f"Error extracting Reddit trends: {e}")
             
         return trends
     
-    async def _extract_github_trends(self) -> List[Dict]:
+    async def _extract_github_trends(self) -> List[Trend]:
         """Extract trends from GitHub trending repositories."""
         trends = []
         
         try:
-            async with aiohttp.ClientSession() as session:
-                # GitHub trending API endpoint (unofficial)
-                url = "https://api.github.com/search/repositories"
-                params = {
-                    'q': 'language:python machine-learning OR ai OR gpu',
-                    'sort': 'stars',
-                    'order': 'desc',
-                    'per_page': 10
-                }
-                
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        for repo in data.get('items', [])[:5]:
-                            topics = repo.get('topics', [])
-                            for topic in topics[:2]:
-                                if topic and len(topic) > 2:
-                                    hashtag = f"#{topic.replace('-', '').capitalize()}"
-                                    trends.append({
-                                        'hashtag': hashtag,
-                                        'source': 'github',
-                                        'score': 0.8,
-                                        'timestamp': datetime.now()
-                                    })
-                                    
+            session = await self._get_session()
+            
+            # GitHub trending API endpoint (unofficial)
+            url = "https://api.github.com/search/repositories"
+            params = {
+                'q': 'language:python machine-learning OR ai OR gpu',
+                'sort': 'stars',
+                'order': 'desc',
+                'per_page': 10
+            }
+            
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    now = datetime.now()
+                    
+                    for repo in data.get('items', [])[:5]:
+                        topics = repo.get('topics', [])
+                        for topic in topics[:2]:
+                            if topic and len(topic) > 2:
+                                hashtag = f"#{topic.replace('-', '').capitalize()}"
+                                trends.append(Trend(
+                                    hashtag=hashtag,
+                                    source='github',
+                                    score=0.8,
+                                    timestamp=now
+                                ))
+                                
         except Exception as e:
             logger.warning(f"Error extracting GitHub trends: {e}")
             
         return trends
     
-    async def _extract_twitter_trends(self) -> List[Dict]:
+    async def _extract_twitter_trends(self) -> List[Trend]:
         """Extract trends from Twitter with fixed query."""
         trends = []
         
@@ -260,7 +411,10 @@ class EnhancedTrendsManager:
             # Fixed query with proper content
             query = "#AI OR #GPU OR #CloudComputing OR #MachineLearning lang:en -is:retweet -is:reply"
             
-            tweets = self.twitter_client.search_recent_tweets(
+            # The client is synchronous; search in a worker thread so the other
+            # extractors' requests keep running on the loop meanwhile
+            tweets = await asyncio.to_thread(
+                self.twitter_client.search_recent_tweets,
                 query=query,
                 max_results=20,
                 tweet_fields=['created_at', 'entities']
@@ -270,21 +424,17 @@ class EnhancedTrendsManager:
             await self.store.record_api_read('twitter_search')
             
             if tweets and tweets.data:
-                hashtag_counter = Counter()
-                
-                for tweet in tweets.data:
-                    if tweet.entities and 'hashtags' in tweet.entities:
-                        for tag in tweet.entities['hashtags']:
-                            hashtag = f"#{tag['tag']}"
-                            hashtag_counter[hashtag] += 1
+                now = datetime.now()
+                hashtag_counter = Counter(
+                    f"#{tag['tag']}"
+                    for tweet in tweets.data
+                    for tag in (tweet.entities or {}).get('hashtags', ())
+                )
                 
-                for hashtag, count in hashtag_counter.most_common(10):
-                    trends.append({
-                        'hashtag': hashtag,
-                        'source': 'twitter',
-                        'score': count,
-                        'timestamp': datetime.now()
-                    })
+                trends = [
+                    Trend(hashtag=hashtag, source='twitter', score=count, timestamp=now)
+                    for hashtag, count in hashtag_counter.most_common(10)
+                ]
                     
         except Exception as e:
             logger.error(f"Error extracting Twitter trends: {e}")
@@ -293,85 +443,107 @@ class EnhancedTrendsManager:
     
     def _calculate_relevance_score(self, text: str) -> float:
         """Calculate relevance score using keyword matching and semantic similarity."""
+        return self._calculate_relevance_scores([text])[0]
+    
+    def _calculate_relevance_scores(self, texts: List[str]) -> List[float]:
+        """Calculate relevance scores for many hashtags, scoring cache misses in one batch."""
         try:
             # Clean the text
-            clean_text = text.lower().replace('#', '').replace('_', ' ')
-            
-            # Direct keyword matching (high confidence)
-            keywords = ['gpu', 'ai', 'cloud', 'compute', 'ml', 'deep', 'learning', 
-                       'neural', 'kubernetes', 'docker', 'server', 'latency', 
-                       'performance', 'scale', 'infrastructure', 'llm', 'model']
-            
-            keyword_score = 0
-            for keyword in keywords:
-                if keyword in clean_text:
-                    keyword_score += 0.3
-            
-            # Cap keyword score at 1.0
-            keyword_score = min(1.0, keyword_score)
-            
-            # If we have a good keyword match, use it
-            if keyword_score >= 0.6:
-                return keyword_score
-            
-            # Otherwise try vectorization
-            try:
-                text_vector = self.vectorizer.transform([clean_text])
-                similarities = cosine_similarity(text_vector, self.relevance_vectors)
-                vector_score = float(np.max(similarities))
-                
-                # Combine scores with weight on keyword matching
-                return max(keyword_score, vector_score * 0.7 + keyword_score * 0.3)
-            except:
-                # Fallback to keyword score only
-                return keyword_score
+            clean_texts = [text.lower().translate(self._CLEAN_TABLE) for text in texts]
+            
+            scores = {}
+            missing = []
+            for clean_text in clean_texts:
+                if clean_text in scores:
+                    continue
+                score = self._relevance_cache.get(clean_text)
+                if score is None:
+                    missing.append(clean_text)
+                else:
+                    self._relevance_cache.move_to_end(clean_text)
+                scores[clean_text] = score
+            
+            if missing:
+                for clean_text, score in zip(missing, self._vector_scores_batch(missing)):
+                    if len(self._relevance_cache) >= RELEVANCE_CACHE_SIZE:
+                        self._relevance_cache.popitem(last=False)
+                    scores[clean_text] = self._relevance_cache[clean_text] = score
+            
+            return [scores[clean_text] for clean_text in clean_texts]
                 
         except Exception as e:
             logger.warning(f"Error calculating relevance: {e}")
             # Default score for tech-related hashtags
-            if any(kw in text.lower() for kw in ['gpu', 'ai', 'cloud', 'ml']):
-                return 0.7
-            return 0.3
+            return [
+                0.7 if any(kw in text.lower() for kw in ['gpu', 'ai', 'cloud', 'ml']) else 0.3
+                for text in texts
+            ]
+    
+    def _keyword_score(self, clean_text: str) -> float:
+        """Score a cleaned hashtag by direct keyword matches (high confidence)."""
+        # No two keywords can start at the same position, so this finds each present keyword
+        found = set()
+        for match in _KEYWORD_RE.finditer(clean_text):
+            found.add(match.group(1))
+            # Cap keyword score at 1.0: further matches cannot change it
+            if len(found) >= _KEYWORD_CAP_HITS:
+                return 1.0
+
+        return min(1.0, len(found) * 0.3)
     
-    def _score_trends_with_relevance(self, trends: List[Dict]) -> List[Dict]:
-        """Score trends with relevance to AI/GPU/Cloud computing."""
-        scored = []
+    def _vector_scores_batch(self, clean_texts: List[str]) -> List[float]:
+        """Score cleaned hashtags, running one TF-IDF transform for all weak keyword matches."""
+        keyword_scores = np.array([self._keyword_score(text) for text in clean_texts], dtype=float)
+        scores = keyword_scores.copy()
         
-        for trend in trends:
-            hashtag = trend['hashtag']
-            
-            # Calculate relevance score
-            relevance = self._calculate_relevance_score(hashtag)
-            
-            # Boost score for certain sources
-            source_boost = {
-                'twitter': 1.2,
-                'github': 1.1,
-                'reddit': 1.0,
-                'news': 1.15,
-                'semantic': 0.8
-            }.get(trend.get('source', 'unknown'), 1.0)
-            
-            # Time decay factor
-            age_hours = (datetime.now() - trend.get('timestamp', datetime.now())).total_seconds() / 3600
-            time_factor = max(0.5, 1 - (age_hours / 24))
-            
-            # Combined score
-            base_score = trend.get('score', 1.0)
-            final_score = base_score * source_boost * time_factor * (1 + relevance)
-            
-            scored.append({
-                **trend,
-                'relevance_score': relevance,
-                'final_score': final_score
-            })
+        # A good keyword match is used as is; the rest try vectorization, unless
+        # no term of theirs is in the vocabulary (a zero vector, so a zero similarity)
+        weak = keyword_scores < 0.6
+        if weak.any():
+            try:
+                vectorizer, relevance_vectors_t, analyzer, vocabulary = self._tfidf
+                for i in np.flatnonzero(weak):
+                    if not any(term in vocabulary for term in analyzer(clean_texts[i])):
+                        weak[i] = False
+                if weak.any():
+                    text_vectors = vectorizer.transform([text for text, w in zip(clean_texts, weak) if w])
+                    vector_scores = (text_vectors @ relevance_vectors_t).toarray().max(axis=1)
+                    
+                    # Combine scores with weight on keyword matching
+                    scores[weak] = np.maximum(keyword_scores[weak], vector_scores * 0.7 + keyword_scores[weak] * 0.3)
+            except Exception:
+                # Fallback to keyword score only
+                pass
+        
+        return scores.tolist()
+    
+    def _score_trends_with_relevance(self, trends: List[Trend]) -> List[Trend]:
+        """Score trends with relevance to AI/GPU/Cloud computing (in place)."""
+        # Calculate relevance scores for the whole batch at once
+        relevances = self._calculate_relevance_scores([trend.hashtag for trend in trends])
+        if not trends:
+            return trends
         
-        # Sort by final score
-        scored.sort(key=lambda x: x['final_score'], reverse=True)
+        # Boost score for certain sources
+        source_boosts = np.array([SOURCE_BOOST.get(trend.source, 1.0) for trend in trends])
         
-        return scored
+        # Time decay factor
+        timestamps = np.array([trend.timestamp.timestamp() for trend in trends])
+        age_hours = (datetime.now().timestamp() - timestamps) / 3600
+        time_factors = np.maximum(0.5, 1 - (age_hours / 24))
+        
+        # Combined score
+        base_scores = np.array([trend.score for trend in trends], dtype=float)
+        final_scores = base_scores * source_boosts * time_factors * (1 + np.array(relevances))
+        
+        for trend, relevance, final_score in zip(trends, relevances, final_scores.tolist()):
+            trend.relevance_score = relevance
+            trend.final_score = final_score
+        
+        # Sort by final score (stable, so ties keep their source order)
+        return [trends[i] for i in np.argsort(-final_scores, kind='stable')]
     
-    def _create_bridge_trends(self, off_topic_trends: List[Dict]) -> List[Dict]:
+    def _create_bridge_trends(self, off_topic_trends: List[Trend]) -> List[Trend]:
         """Create bridge content connecting off-topic trends to GPU computing."""
         bridged = []
         
@@ -383,130 +555,102 @@ class EnhancedTrendsManager:
             "Why {topic} needs elastic compute"
         ]
         
+        now = datetime.now()
         for trend in off_topic_trends:
-            if trend.get('relevance_score', 0) < self.config.MIN_RELEVANCE_SCORE:
+            if trend.relevance_score < self.config.MIN_RELEVANCE_SCORE:
                 # Extract topic from hashtag
-                topic = trend['hashtag'].replace('#', '').lower()
+                topic = trend.hashtag.replace('#', '').lower()
                 
                 # Create bridged hashtags
                 bridge_text = random.choice(bridge_templates).format(topic=topic)
                 
-                bridged.append({
-                    'hashtag': f"#{topic.capitalize()}GPU",
-                    'source': 'bridge',
-                    'score': 0.7,
-                    'timestamp': datetime.now(),
-                    'relevance_score': 0.6,
-                    'bridge_text': bridge_text
-                })
+                bridged.append(Trend(
+                    hashtag=f"#{topic.capitalize()}GPU",
+                    source='bridge',
+                    score=0.7,
+                    timestamp=now,
+                    relevance_score=0.6,
+                    bridge_text=bridge_text
+                ))
         
         return bridged
     
-    def _generate_semantic_hashtags(self) -> List[Dict]:
+    def _generate_semantic_hashtags(self) -> List[Trend]:
         """Generate semantic hashtags related to GPU/cloud computing."""
-        trends = []
-        
-        contexts = [
-            ('gpu_computing', ['GPUComputing', 'CloudGPU', 'HPCCloud']),
-            ('ai_infrastructure', ['AIInfra', 'MLOps', 'DeepLearning']),
-            ('cloud_native', ['CloudNative', 'Serverless', 'K8s']),
-            ('performance', ['HighPerformance', 'LowLatency', 'FastCompute']),
-            ('cost_optimization', ['CostOptimized', 'PayPerUse', 'ElasticScale']),
-            ('innovation', ['TechInnovation', 'NextGenCompute', 'FutureCloud'])
+        now = datetime.now()
+        return [
+            Trend(hashtag=hashtag, source='semantic', score=0.5, timestamp=now, relevance_score=0.8)
+            for hashtags in random.sample(_SEMANTIC_POOL, min(4, len(_SEMANTIC_POOL)))
+            for hashtag in hashtags
         ]
-        
-        selected = random.sample(contexts, min(4, len(contexts)))
-        
-        for context_name, hashtags in selected:
-            for hashtag in hashtags:
-                trends.append({
-                    'hashtag': f"#{hashtag}",
-                    'source': 'semantic',
-                    'score': 0.5,
-                    'timestamp': datetime.now(),
-                    'relevance_score': 0.8
-                })
-        
-        return trends
     
-    def _filter_trends(self, trends: List[Dict]) -> List[Dict]:
+    def _filter_trends(self, trends: List[Trend]) -> List[Trend]:
         """Filter out NSFW and sensitive political content."""
-        filtered = []
-        
-        for trend in trends:
-            hashtag_lower = trend['hashtag'].lower()
-            
-            # Check for NSFW content
-            if any(nsfw in hashtag_lower for nsfw in self.NSFW_KEYWORDS):
-                continue
-                
-            # Check for political content
-            if any(pol in hashtag_lower for pol in self.POLITICAL_KEYWORDS):
-                continue
-                
-            # Check for minimum length
-            if len(trend['hashtag']) < 3 or len(trend['hashtag']) > 30:
-                continue
-                
-            filtered.append(trend)
-            
-        return filtered
+        # Length bounds first, then one regex scan for NSFW or political content
+        return [
+            trend for trend in trends
+            if 3 <= len(trend.hashtag) <= 30 and not self._BLOCK_RE.search(trend.hashtag.lower())
+        ]
     
-    def _load_cache(self) -> Optional[List[Dict]]:
+    def _load_cache(self) -> Optional[List[Trend]]:
         """Load trends from cache if still valid."""
         try:
-            if not self.cache_file.exists():
+            try:
+                mtime = self.cache_file.stat().st_mtime_ns
+            except FileNotFoundError:
                 return None
-                
-            with open(self.cache_file, 'r') as f:
-                cache_data = json.load(f)
-                
-            cache_time = datetime.fromisoformat(cache_data['timestamp'])
+            
+            # Only re-parse the file when it has changed since the last read
+            if mtime != self._cache_mtime or self._cache_data is None:
+                cache_data = loads_json(self.cache_file.read_bytes())
+                self._cache_data = (
+                    datetime.fromisoformat(cache_data['timestamp']),
+                    [Trend.from_dict(trend) for trend in cache_data['trends']]
+                )
+                self._cache_mtime = mtime
+            cache_time, trends = self._cache_data
             
             # Check if cache is still valid
             if datetime.now() - cache_time < self.cache_duration:
-                return cache_data['trends']
+                return trends
                 
         except Exception as e:
             logger.warning(f"Error loading cache: {e}")
             
         return None
     
-    def _save_cache(self, trends: List[Dict]):
+    def _save_cache(self, trends: List[Trend]):
         """Save trends to cache file."""
         try:
             self.cache_file.parent.mkdir(exist_ok=True)
             
-            # Convert datetime objects to strings
-            serializable_trends = []
-            for trend in trends:
-                trend_copy = trend.copy()
-                if 'timestamp' in trend_copy and isinstance(trend_copy['timestamp'], datetime):
-                    trend_copy['timestamp'] = trend_copy['timestamp'].isoformat()
-                serializable_trends.append(trend_copy)
-            
+            # Datetimes are written as ISO 8601 strings by the serializer
             cache_data = {
-                'timestamp': datetime.now().isoformat(),
-                'trends': serializable_trends
+                'timestamp': datetime.now(),
+                'trends': [trend.to_dict() for trend in trends]
             }
             
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            # Write beside the cache and swap it in, so readers never see a partial file
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            tmp_file.write_bytes(dumps_json(cache_data))
+            os.replace(tmp_file, self.cache_file)
                 
         except Exception as e:
             logger.warning(f"Error saving cache: {e}")
     
     async def get_trending_hashtags(self, count: int = 3) -> List[str]:
         """Get current trending hashtags for use in posts."""
-        # Refresh if needed (older than cache duration)
-        if not self.cached_trends or not self.last_refresh or \
-           (datetime.now() - self.last_refresh) > self.cache_duration:
-            await self.refresh_trends()
+        # Refresh if needed (older than cache duration); concurrent callers share one refresh
+        if self._needs_refresh():
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self.refresh_trends())
+            # Shielded so one cancelled caller does not abort the refresh for the others
+            await asyncio.shield(self._refresh_task)
         
         # Filter for high relevance only
         relevant = [
             t for t in self.cached_trends 
-            if t.get('relevance_score', 0) >= self.config.MIN_RELEVANCE_SCORE
+            if t.relevance_score >= self.config.MIN_RELEVANCE_SCORE
         ]
         
         if not relevant:
@@ -517,7 +661,12 @@ class EnhancedTrendsManager:
         pool = relevant[:pool_size]
         
         selected = random.sample(pool, min(count, len(pool)))
-        return [trend['hashtag'] for trend in selected]
+        return [trend.hashtag for trend in selected]
+    
+    def _needs_refresh(self) -> bool:
+        """Whether the in-memory trends are missing or older than the cache duration."""
+        return not self.cached_trends or not self.last_refresh or \
+            (datetime.now() - self.last_refresh) > self.cache_duration
     
     def get_trend_samples(self) -> List[str]:
         """Get sample of current trends for status display."""
@@ -527,7 +676,7 @@ class EnhancedTrendsManager:
         # Show only relevant trends
         relevant = [
             t for t in self.cached_trends[:10]
-            if t.get('relevance_score', 0) >= self.config.MIN_RELEVANCE_SCORE
+            if t.relevance_score >= self.config.MIN_RELEVANCE_SCORE
         ]
         
-        return [f"{t['hashtag']} ({t.get('relevance_score', 0):.2f})" for t in relevant[:5]]
+        return [f"{t.hashtag} ({t.relevance_score:.2f})" for t in relevant[:5]]
@@ -136,7 +136,7 @@ class TwitterClient:
             try:
                 from .rate_limit_tracker import rate_limit_tracker
                 rate_limit_tracker.record_post_attempt(self.account_id, success=False, error_type='rate_limit')
-                rate_limit_tracker.print_status()
+                await rate_limit_tracker.print_status_async()
             except ImportError:
                 pass
             return None
@@ -0,0 +1,73 @@
+"""
+Unit tests for the response cache module.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    """Test suite for ResponseCache."""
+    
+    @pytest.fixture
+    def cache(self):
+        """Create cache instance."""
+        return ResponseCache(stale_ttl=60)
+    
+    @pytest.mark.asyncio
+    async def test_hit_within_ttl(self, cache):
+        """Test the producer runs once while the entry is fresh."""
+        producer = AsyncMock(return_value={'value': 1})
+        
+        with patch('app.response_cache.time.monotonic', return_value=100.0):
+            first = await cache.get('status', 5, producer)
+            second = await cache.get('status', 5, producer)
+        
+        producer.assert_called_once()
+        assert first.headers['X-Cache'] == 'MISS'
+        assert second.headers['X-Cache'] == 'HIT'
+        assert first.body == second.body
+    
+    @pytest.mark.asyncio
+    async def test_rebuild_after_ttl(self, cache):
+        """Test an expired entry is rebuilt."""
+        producer = AsyncMock(side_effect=[{'value': 1}, {'value': 2}])
+        
+        with patch('app.response_cache.time.monotonic', return_value=100.0):
+            first = await cache.get('status', 5, producer)
+        with patch('app.response_cache.time.monotonic', return_value=106.0):
+            second = await cache.get('status', 5, producer)
+        
+        assert second.headers['X-Cache'] == 'MISS'
+        assert first.headers['ETag'] != second.headers['ETag']
+    
+    @pytest.mark.asyncio
+    async def test_etag_not_modified(self, cache):
+        """Test a matching If-None-Match gets a 304 without a body."""
+        producer = AsyncMock(return_value={'value': 1})
+        
+        with patch('app.response_cache.time.monotonic', return_value=100.0):
+            first = await cache.get('status', 5, producer)
+            second = await cache.get('status', 5, producer, if_none_match=first.headers['ETag'])
+        
+        assert second.status_code == 304
+        assert second.body == b''
+    
+    @pytest.mark.asyncio
+    async def test_stale_on_error(self, cache):
+        """Test a failing producer serves the stale entry, then raises once it is too old."""
+        producer = AsyncMock(side_effect=[{'value': 1}, RuntimeError('db down'), RuntimeError('db down')])
+        
+        with patch('app.response_cache.time.monotonic', return_value=100.0):
+            first = await cache.get('status', 5, producer)
+        with patch('app.response_cache.time.monotonic', return_value=110.0):
+            stale = await cache.get('status', 5, producer)
+        
+        assert stale.headers['X-Cache'] == 'STALE'
+        assert stale.body == first.body
+        
+        with patch('app.response_cache.time.monotonic', return_value=200.0):
+            with pytest.raises(RuntimeError):
+                await cache.get('status', 5, producer)
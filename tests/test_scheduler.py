@@ -6,7 +6,8 @@ import pytest
 import asyncio
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from datetime import datetime, timedelta, time
-import pytz
+from zoneinfo import ZoneInfo
+from apscheduler.triggers.interval import IntervalTrigger
 
 from app.scheduler import PostScheduler
 from app.config import Config
@@ -23,7 +24,7 @@ class TestPostScheduler:
     def mock_config(self):
         """Create mock config."""
         config = Mock(spec=Config)
-        config.timezone = pytz.timezone('Europe/Paris')
+        config.timezone = ZoneInfo('Europe/Paris')
         config.post_interval_minutes = 90
         config.min_gap_between_accounts = 45
         config.daily_writes_target = 10
@@ -128,26 +129,107 @@ class TestPostScheduler:
         scheduler.last_post_times['B'] = now - timedelta(minutes=30)  # 30 minutes ago
         
         with patch.object(scheduler, '_is_within_window', return_value=True):
-            with patch.object(asyncio, 'sleep') as mock_sleep:
+            with patch.object(scheduler.scheduler, 'add_job') as mock_add_job:
                 await scheduler._post_for_account('A')
                 
-                # Should wait 15 more minutes (45 - 30)
-                mock_sleep.assert_called()
-                wait_time = mock_sleep.call_args[0][0]
+                # Should be rescheduled 15 minutes later (45 - 30) instead of posting now
+                mock_add_job.assert_called_once()
+                trigger = mock_add_job.call_args[0][1]
+                wait_time = (trigger.run_date - now).total_seconds()
                 assert 14 * 60 < wait_time < 16 * 60  # Allow some tolerance
+                mock_composer.compose_tweet.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_gap_retry_reschedules_without_blocking(self, scheduler, mock_twitter_clients,
+                                                          mock_composer, mock_trends_manager, mock_config):
+        """Test a too-early post is rescheduled as a tracked job and posts once the gap has passed."""
+        scheduler.initialize(mock_twitter_clients, mock_composer, mock_trends_manager)
+        now = datetime.now(mock_config.timezone)
+        scheduler.last_post_times['B'] = now - timedelta(minutes=30)
+        
+        with patch.object(scheduler, '_is_within_window', return_value=True):
+            await scheduler._post_for_account('A')
+            
+            # The retry is a one-off job for A, and no lock is held while waiting for it
+            job = scheduler.scheduler.get_job('gap_retry_post_A')
+            assert job is not None and job.args == ('A',)
+            assert 'gap_retry_post_A' in scheduler._account_jobs['A']
+            assert not scheduler.posting_locks['A'].locked()
+            assert scheduler.last_post_times['A'] is None
+            
+            # When the retry fires after the gap, A posts
+            scheduler.last_post_times['B'] = now - timedelta(minutes=46)
+            await scheduler._post_for_account('A')
+        
+        mock_twitter_clients['A'].post_tweet.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_accounts_respect_gap(self, scheduler, mock_twitter_clients,
+                                                   mock_composer, mock_trends_manager, mock_store):
+        """Test A and B firing together don't both post within the gap."""
+        scheduler.initialize(mock_twitter_clients, mock_composer, mock_trends_manager)
+        
+        async def slow_compose(account):
+            await asyncio.sleep(0.01)
+            return f"Test tweet for {account}"
+        mock_composer.compose_tweet.side_effect = slow_compose
+        
+        with patch.object(scheduler, '_is_within_window', return_value=True):
+            with patch.object(scheduler.scheduler, 'add_job') as mock_add_job:
+                await asyncio.gather(scheduler._post_for_account('A'), scheduler._post_for_account('B'))
+        
+        # A posts, B is rescheduled for after the gap
+        mock_twitter_clients['A'].post_tweet.assert_called_once()
+        mock_twitter_clients['B'].post_tweet.assert_not_called()
+        assert mock_add_job.call_args.kwargs['id'] == 'gap_retry_post_B'
+        mock_store.record_post.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_failed_post_releases_gap_reservation(self, scheduler, mock_twitter_clients,
+                                                        mock_composer, mock_trends_manager):
+        """Test a failed post doesn't block the other account."""
+        scheduler.initialize(mock_twitter_clients, mock_composer, mock_trends_manager)
+        mock_twitter_clients['A'].post_tweet.return_value = None
+        
+        with patch.object(scheduler, '_is_within_window', return_value=True):
+            await scheduler._post_for_account('A')
+            assert scheduler.last_post_times['A'] is None
+        
+            await scheduler._post_for_account('B')
+        
+        mock_twitter_clients['B'].post_tweet.assert_called_once()
+    
+    def test_ensure_job_replaces_changed_job(self, scheduler, mock_config):
+        """Test unchanged jobs are kept and changed triggers or options replace them."""
+        start = datetime(2030, 1, 1, 9, 0, tzinfo=mock_config.timezone)
+        func = AsyncMock()
+        
+        with patch.object(scheduler.scheduler, 'add_job', wraps=scheduler.scheduler.add_job) as mock_add_job:
+            scheduler._ensure_job(func, IntervalTrigger(minutes=20, start_date=start), 'job', 'Job')
+            scheduler._ensure_job(func, IntervalTrigger(minutes=20, start_date=start), 'job', 'Job')
+            assert mock_add_job.call_count == 1
+            
+            # Same interval, different start date
+            scheduler._ensure_job(func, IntervalTrigger(minutes=20, start_date=start + timedelta(minutes=5)), 'job', 'Job')
+            assert mock_add_job.call_count == 2
+            
+            # Same trigger, different job option
+            scheduler._ensure_job(func, IntervalTrigger(minutes=20, start_date=start + timedelta(minutes=5)), 'job', 'Job',
+                                  misfire_grace_time=60)
+            assert mock_add_job.call_count == 3
     
     def test_is_within_window(self, scheduler, mock_config):
         """Test posting window check."""
         # During window
-        dt1 = mock_config.timezone.localize(datetime(2024, 1, 1, 12, 0))
+        dt1 = datetime(2024, 1, 1, 12, 0, tzinfo=mock_config.timezone)
         assert scheduler._is_within_window(dt1)
         
         # Before window
-        dt2 = mock_config.timezone.localize(datetime(2024, 1, 1, 8, 0))
+        dt2 = datetime(2024, 1, 1, 8, 0, tzinfo=mock_config.timezone)
         assert not scheduler._is_within_window(dt2)
         
         # After window
-        dt3 = mock_config.timezone.localize(datetime(2024, 1, 1, 23, 45))
+        dt3 = datetime(2024, 1, 1, 23, 45, tzinfo=mock_config.timezone)
         assert not scheduler._is_within_window(dt3)
     
     def test_extract_hashtags(self, scheduler):
@@ -0,0 +1,128 @@
+"""
+Unit tests for the store module.
+"""
+
+import pytest
+import pytest_asyncio
+import sqlite3
+import hashlib
+from unittest.mock import Mock
+from datetime import datetime
+
+from app.config import Config
+from app.store import Store
+
+
+class TestStoreMigrations:
+    """Test suite for Store schema migrations on existing databases."""
+    
+    @pytest.fixture
+    def legacy_db(self, tmp_path, monkeypatch):
+        """Create a database in the pre-migration layout, in a temporary data/ dir."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "data").mkdir()
+        conn = sqlite3.connect(tmp_path / "data" / "bot.db")
+        conn.executescript("""
+            CREATE TABLE posts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                account TEXT NOT NULL,
+                tweet_id TEXT,
+                content TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                hashtags TEXT,
+                posted_at TIMESTAMP NOT NULL,
+                success BOOLEAN NOT NULL DEFAULT 0,
+                error_message TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        content = "GPU day #AI #GPU"
+        conn.execute(
+            "INSERT INTO posts (account, tweet_id, content, content_hash, hashtags, posted_at, success) "
+            "VALUES (?, ?, ?, ?, ?, ?, 1)",
+            ('A', '1', content, hashlib.sha256(content.encode()).hexdigest()[:16], '#AI #GPU',
+             datetime(2024, 5, 1, 12, 30))
+        )
+        conn.commit()
+        conn.close()
+        return tmp_path / "data" / "bot.db"
+    
+    @pytest.fixture
+    def mock_config(self):
+        """Create mock config."""
+        config = Mock(spec=Config)
+        config.STORE_READ_POOL_SIZE = 1
+        return config
+    
+    @pytest.mark.asyncio
+    async def test_initialize_migrates_legacy_posts(self, legacy_db, mock_config):
+        """Test posted_date, post_hashtags and content hashes are backfilled once."""
+        store = Store(mock_config)
+        await store.initialize()
+        # A second start must not duplicate the backfills
+        await store.initialize()
+        await store.close()
+        
+        conn = sqlite3.connect(legacy_db)
+        try:
+            assert conn.execute("SELECT posted_date FROM posts").fetchone() == ('2024-05-01',)
+            assert sorted(conn.execute("SELECT post_id, hashtag FROM post_hashtags").fetchall()) == [
+                (1, '#AI'), (1, '#GPU')
+            ]
+            assert conn.execute("SELECT content_hash FROM posts").fetchone() == (
+                Store.get_content_hash("GPU day #AI #GPU"),
+            )
+        finally:
+            conn.close()
+    
+    @pytest.mark.asyncio
+    async def test_record_post_writes_hashtag_rows(self, legacy_db, mock_config):
+        """Test new posts store their hashtags one per row."""
+        store = Store(mock_config)
+        await store.initialize()
+        post_id = await store.record_post('B', '2', "Scale out #Cloud", ['#Cloud'])
+        assert await store.get_unique_hashtags() == ['#Cloud']
+        await store.close()
+        
+        conn = sqlite3.connect(legacy_db)
+        try:
+            assert conn.execute(
+                "SELECT hashtag FROM post_hashtags WHERE post_id = ?", (post_id,)
+            ).fetchall() == [('#Cloud',)]
+        finally:
+            conn.close()
+
+
+class TestStoreStreaming:
+    """Test suite for streaming recent posts in batches."""
+    
+    @pytest_asyncio.fixture
+    async def store(self, tmp_path, monkeypatch):
+        """Create a store with six posts for account A in a temporary data/ dir."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr('app.store.STREAM_BATCH_SIZE', 2)
+        config = Mock(spec=Config)
+        config.STORE_READ_POOL_SIZE = 1
+        store = Store(config)
+        await store.initialize()
+        for i in range(6):
+            await store.record_post('A', str(i), f"Post {i}", [])
+        yield store
+        await store.close()
+    
+    @pytest.mark.asyncio
+    async def test_iter_recent_posts_batches(self, store):
+        """Test posts stream newest first across batches, up to the limit."""
+        tweet_ids = [post['tweet_id'] async for post in store.iter_recent_posts('A', limit=5)]
+        assert tweet_ids == ['5', '4', '3', '2', '1']
+        
+        expected = [post['tweet_id'] for post in await store.get_recent_posts('A', limit=10)]
+        assert [post['tweet_id'] async for post in store.iter_recent_posts('A', limit=10)] == expected
+    
+    @pytest.mark.asyncio
+    async def test_iter_recent_posts_releases_reader(self, store):
+        """Test the pooled reader is back in the pool while the consumer holds a post."""
+        posts = store.iter_recent_posts('A', limit=5)
+        await posts.__anext__()
+        assert store._read_pool.qsize() == len(store._read_conns) == 1
+        await posts.aclose()
@@ -0,0 +1,138 @@
+"""
+Unit tests for the trends module.
+"""
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+from datetime import datetime, timedelta
+from tweepy import Response, TooManyRequests
+
+from app.config import Config
+from app.store import Store
+from app.trends import TrendsManager
+
+
+class FakeBearerClient:
+    """Bearer client serving canned search pages linked by next_token."""
+    
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+    
+    def search_recent_tweets(self, query, next_token=None, **kwargs):
+        self.calls.append(next_token)
+        index = int(next_token or 0)
+        if isinstance(self.pages[index], Exception):
+            raise self.pages[index]
+        tweets = [
+            Mock(entities={'hashtags': [{'tag': tag} for tag in tags]})
+            for tags in self.pages[index]
+        ]
+        meta = {'next_token': str(index + 1)} if index + 1 < len(self.pages) else {}
+        return Response(tweets, {}, [], meta)
+
+
+class TestTrendsManager:
+    """Test suite for TrendsManager."""
+    
+    @pytest.fixture
+    def mock_config(self):
+        """Create mock config."""
+        config = Mock(spec=Config)
+        config.X_READS_MODE = 'normal'
+        config.MAX_READS_PER_DAY = 100
+        config.TWITTER_SEARCH_PAGES = 3
+        return config
+    
+    @pytest.fixture
+    def mock_store(self):
+        """Create mock store."""
+        store = Mock(spec=Store)
+        store.get_reads_today = AsyncMock(return_value=0)
+        return store
+    
+    @pytest.fixture
+    def trends_manager(self, mock_config, mock_store):
+        """Create trends manager instance."""
+        return TrendsManager(mock_config, mock_store)
+    
+    @pytest.mark.asyncio
+    async def test_twitter_trends_paginate(self, trends_manager):
+        """Test hashtags are counted across search pages and each page is one read."""
+        bearer = FakeBearerClient([
+            [['AI', 'GPU'], ['AI']],
+            [['AI', 'CloudComputing'], ['GPU']]
+        ])
+        trends_manager.set_twitter_client(Mock(bearer_client=bearer))
+        
+        trends = await trends_manager._extract_twitter_trends()
+        
+        assert bearer.calls == [None, '1']
+        assert [(t['hashtag'], t['score']) for t in trends] == [
+            ('#AI', 3), ('#GPU', 2), ('#CloudComputing', 1)
+        ]
+        assert trends_manager._pending_api_reads['twitter_search'] == 2
+    
+    @pytest.mark.asyncio
+    async def test_twitter_trends_keep_pages_before_rate_limit(self, trends_manager):
+        """Test a rate limited later page keeps the trends from the pages already fetched."""
+        response = Mock(status_code=429, reason='Too Many Requests')
+        response.json.return_value = {}
+        bearer = FakeBearerClient([
+            [['AI', 'GPU'], ['AI']],
+            TooManyRequests(response),
+            [['LLM']]
+        ])
+        trends_manager.set_twitter_client(Mock(bearer_client=bearer))
+        
+        trends = await trends_manager._extract_twitter_trends()
+        
+        assert bearer.calls == [None, '1']
+        assert [(t['hashtag'], t['score']) for t in trends] == [('#AI', 2), ('#GPU', 1)]
+        assert trends_manager._pending_api_reads['twitter_search'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_twitter_trends_page_limit_respects_quota(self, trends_manager, mock_config, mock_store):
+        """Test paging stops at the reads left in the daily quota."""
+        mock_store.get_reads_today.return_value = mock_config.MAX_READS_PER_DAY - 1
+        bearer = FakeBearerClient([[['AI']], [['GPU']], [['LLM']]])
+        trends_manager.set_twitter_client(Mock(bearer_client=bearer))
+        
+        trends = await trends_manager._extract_twitter_trends()
+        
+        assert bearer.calls == [None]
+        assert [t['hashtag'] for t in trends] == ['#AI']
+    
+    def test_score_memo_tracks_timestamps(self, trends_manager):
+        """Test a later refresh with the same trends gets fresh timestamps and scores."""
+        old = datetime.now() - timedelta(hours=10)
+        first = trends_manager._score_trends([
+            {'hashtag': '#AI', 'source': 'twitter', 'score': 5, 'timestamp': old}
+        ])
+        
+        now = datetime.now()
+        second = trends_manager._score_trends([
+            {'hashtag': '#AI', 'source': 'twitter', 'score': 5, 'timestamp': now}
+        ])
+        
+        assert second is not first
+        assert second[0]['timestamp'] == now
+        assert second[0]['score'] > first[0]['score']
+    
+    def test_score_memo_returns_copies(self, trends_manager):
+        """Test identical inputs are served from the memo without sharing the result list."""
+        now = datetime.now()
+        trends = [{'hashtag': '#GPU', 'source': 'twitter', 'score': 2, 'timestamp': now}]
+        
+        first = trends_manager._score_trends(trends)
+        second = trends_manager._score_trends(trends)
+        
+        assert second is not first
+        assert second[0] is not first[0]
+        assert second[0]['hashtag'] == '#GPU'
+        assert second[0]['sources'] == ['twitter']
+        assert second[0]['score'] == pytest.approx(first[0]['score'])
+        
+        # Mutating a result doesn't leak into later calls
+        second[0]['sources'].append('google')
+        assert trends_manager._score_trends(trends)[0]['sources'] == ['twitter']
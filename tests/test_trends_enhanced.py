@@ -0,0 +1,98 @@
+"""
+Unit tests for the enhanced trends module.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import Mock
+from datetime import datetime
+
+from app import trends_enhanced
+from app.config import Config
+from app.store import Store
+from app.trends_enhanced import EnhancedTrendsManager, Trend
+
+
+class TestEnhancedTrendsManager:
+    """Test suite for EnhancedTrendsManager."""
+    
+    @pytest.fixture
+    def mock_config(self):
+        """Create mock config."""
+        config = Mock(spec=Config)
+        config.MIN_RELEVANCE_SCORE = 0.55
+        config.X_READS_MODE = 'conservative'
+        return config
+    
+    @pytest.fixture
+    def trends_manager(self, mock_config, tmp_path):
+        """Create trends manager instance with its cache files in a temporary dir."""
+        manager = EnhancedTrendsManager(mock_config, Mock(spec=Store))
+        manager.cache_file = tmp_path / "trends_cache.json"
+        return manager
+    
+    def test_relevance_cache_evicts_least_recently_used(self, trends_manager, monkeypatch):
+        """Test a recently read relevance score survives eviction."""
+        monkeypatch.setattr(trends_enhanced, 'RELEVANCE_CACHE_SIZE', 2)
+        
+        trends_manager._calculate_relevance_scores(['#GPUCloud', '#DeepLearning'])
+        trends_manager._calculate_relevance_score('#GPUCloud')
+        trends_manager._calculate_relevance_score('#MLOps')
+        
+        assert list(trends_manager._relevance_cache) == ['gpucloud', 'mlops']
+    
+    @pytest.fixture
+    def counting_refresh(self, trends_manager):
+        """Replace refresh_trends with a slow refresh that counts its runs."""
+        calls = []
+        
+        async def refresh():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            trends_manager.cached_trends = [
+                Trend(hashtag='#GPU', source='news', score=1.0, timestamp=datetime.now(), relevance_score=0.9)
+            ]
+            trends_manager.last_refresh = datetime.now()
+            return trends_manager.cached_trends
+        
+        trends_manager.refresh_trends = refresh
+        return calls
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_refresh(self, trends_manager, counting_refresh):
+        """Test a burst of callers on a stale cache triggers a single refresh."""
+        results = await asyncio.gather(*(trends_manager.get_trending_hashtags(1) for _ in range(10)))
+        
+        assert len(counting_refresh) == 1
+        assert all(result == ['#GPU'] for result in results)
+        
+        # Fresh trends are served without refreshing again
+        await trends_manager.get_trending_hashtags(1)
+        assert len(counting_refresh) == 1
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_keeps_shared_refresh(self, trends_manager, counting_refresh):
+        """Test cancelling one waiting caller doesn't abort the refresh for the others."""
+        first = asyncio.create_task(trends_manager.get_trending_hashtags(1))
+        second = asyncio.create_task(trends_manager.get_trending_hashtags(1))
+        await asyncio.sleep(0)
+        first.cancel()
+        
+        assert await second == ['#GPU']
+        assert len(counting_refresh) == 1
+    
+    def test_trend_cache_round_trip(self, trends_manager):
+        """Test trends survive to_dict, the JSON cache file and from_dict unchanged."""
+        now = datetime.now()
+        trends = [
+            Trend(hashtag='#GPU', source='news', score=0.9, timestamp=now, relevance_score=0.8,
+                  final_score=1.5, topic='GPU shortage'),
+            Trend(hashtag='#K8s', source='reddit', score=0.7, timestamp=now, subreddit='kubernetes')
+        ]
+        
+        # Unset optional fields are left out of the plain dict
+        assert 'bridge_text' not in trends[0].to_dict()
+        assert Trend.from_dict(trends[1].to_dict()) == trends[1]
+        
+        trends_manager._save_cache(trends)
+        assert trends_manager._load_cache() == trends